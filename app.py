@@ -9,7 +9,6 @@ from src.database.config import settings
 # Import all the routers
 from src.api import (
     documents_router,
-    items_router,
     fe_router,
     auth_router, # Added auth router
     ai_suggestions_router, # Added AI suggestions router
@@ -43,8 +42,9 @@ def on_startup():
     """
     db = next(database.get_db())
     try:
-        user_count = db.query(models.User).count()
-        if user_count == 0:
+        # Only existence matters here; fetching one id avoids a COUNT(*) scan
+        user_exists = db.query(models.User.id).first() is not None
+        if not user_exists:
             print("No users found in the database. Creating initial admin user...")
             admin_user = settings.ADMIN_USERNAME
             admin_pass = settings.ADMIN_PASSWORD
@@ -62,7 +62,7 @@ def on_startup():
             db.commit()
             print(f"Admin user '{admin_user}' created successfully.")
         else:
-            print(f"{user_count} user(s) found. Skipping initial user creation.")
+            print("Users already present. Skipping initial user creation.")
     finally:
         db.close()
 
@@ -77,7 +77,6 @@ def read_root():
 # Include all routers with a common prefix
 api_prefix = "/api/v1"
 app.include_router(documents_router.router, prefix=api_prefix)
-app.include_router(items_router.router, prefix=api_prefix)
 # Register the Failure Effects router to expose FE options endpoints
 app.include_router(fe_router.router, prefix=api_prefix)
 
@@ -9,24 +9,20 @@ from pathlib import Path
 # Add src to the path
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
-from parsers.fmea_parser import parse
+from parsers.fmea_parser import iter_parse
 
 def check_current_fields():
     """Check current fields"""
     file_path = r"docs\W-PE2169-01 潛在失效模式及後果分析AIAG-VDA Process FMEA (晶粒黏著共晶Eutectic DB 1610).xlsx"
     
     try:
-        result = parse(file_path)
+        # Stream the records: only the first one is kept, the rest are counted
+        records = iter_parse(file_path)
+        first_record = next(records, None)
+        record_count = 0 if first_record is None else 1 + sum(1 for _ in records)
+        print(f"SUCCESS: Parsed {record_count} records")
         
-        if result.get('status') != 'success':
-            print(f"ERROR: {result.get('message')}")
-            return False
-            
-        data = result.get('data', [])
-        print(f"SUCCESS: Parsed {len(data)} records")
-        
-        if data:
-            first_record = data[0]
+        if first_record is not None:
             print(f"\nActual fields created ({len(first_record)}):")
             print("-" * 60)
             
@@ -15,7 +15,8 @@ CREATE TABLE IF NOT EXISTS `fmcp_documents` (
   `version` VARCHAR(50) DEFAULT '1.0',
   `uploaded_by` VARCHAR(100) NOT NULL,
   `created_at` TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-  `updated_at` TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+  `updated_at` TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  KEY `idx_documents_created_at` (`created_at`)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
 
 -- Table to store header information for FMEA documents.  These fields
@@ -93,6 +94,7 @@ CREATE TABLE IF NOT EXISTS `fmcp_fmea_fe_items` (
   `severity` TINYINT,
   `created_at` TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
   `updated_at` TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  KEY `idx_fe_items_document_severity` (`document_id`, `severity`),
   FOREIGN KEY (`document_id`) REFERENCES `fmcp_documents`(`id`) ON DELETE CASCADE
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
 
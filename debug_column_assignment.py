@@ -3,7 +3,6 @@
 Debug column assignment to see what data is actually in each column
 """
 
-import pandas as pd
 import sys
 from pathlib import Path
 
@@ -11,6 +10,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
 from parsers.fmea_parser import _flatten_columns
+from parsers.excel_engine import read_sheet_rows
 
 def debug_column_assignment():
     """Debug column assignment"""
@@ -20,22 +20,36 @@ def debug_column_assignment():
     print("=" * 60)
     
     try:
-        # Read Excel with multi-header
-        df = pd.read_excel(file_path, sheet_name='00', header=[8, 9])
-        
+        # Only the two header rows and the first data row are needed, so
+        # read raw cell values instead of building a DataFrame
+        rows = read_sheet_rows(file_path, "00", nrows=11)
+        header_row9, header_row10 = rows[8], rows[9]
+        first_data_row = rows[10] if len(rows) > 10 else []
+        # Stringify each cell once; both reports below only slice the text
+        first_row_text = [None if value is None else str(value) for value in first_data_row]
+        num_cols = len(header_row9)
+
+        # Merged header cells only carry a value in their first column;
+        # forward-fill them the way read_excel(header=[8, 9]) does
+        filled_row9 = []
+        last = None
+        for value in header_row9:
+            last = value if value is not None else last
+            filled_row9.append(last)
+
         # Flatten columns
-        flattened_cols = _flatten_columns(df.columns)
+        flattened_cols = _flatten_columns(list(zip(filled_row9, header_row10)))
         
         # Show the actual data in each column for first row
         print(f"Checking data in first 20 columns:")
         print("-" * 60)
         
-        for i in range(min(20, len(df.columns))):
+        for i in range(min(20, num_cols)):
             col_name = flattened_cols[i] if i < len(flattened_cols) else f"Column_{i}"
-            value = df.iloc[0, i] if i < len(df.columns) else "N/A"
+            value = first_row_text[i] if i < len(first_row_text) else None
             
             print(f"Column {i:2d}: {col_name}")
-            print(f"    Value: {repr(str(value)[:100]) if pd.notna(value) else 'NaN/None'}")
+            print(f"    Value: {repr(value[:100]) if value is not None else 'NaN/None'}")
             print()
             
         # Based on your requirements, these should be the correct assignments:
@@ -65,11 +79,11 @@ def debug_column_assignment():
         print("-" * 60)
         
         for col_idx, (field_name, expected) in correct_assignments.items():
-            if col_idx < len(df.columns):
-                actual_value = df.iloc[0, col_idx]
+            if col_idx < num_cols:
+                actual_value = first_row_text[col_idx] if col_idx < len(first_row_text) else None
                 print(f"Column {col_idx:2d} -> {field_name}")
                 print(f"    Expected: {expected}")
-                print(f"    Actual: {repr(str(actual_value)[:80]) if pd.notna(actual_value) else 'NaN/None'}")
+                print(f"    Actual: {repr(actual_value[:80]) if actual_value is not None else 'NaN/None'}")
                 print()
             else:
                 print(f"Column {col_idx:2d} -> {field_name} (MISSING - beyond available columns)")
@@ -9,6 +9,8 @@ import os
 # Add the project root to sys.path so we can import from src
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+from src.parsers.excel_engine import EXCEL_ENGINE
+
 def create_exact_mapping():
     """Create the exact mapping based on the debug analysis"""
     file_path = "docs/W-PE2169-01 潛在失效模式及後果分析AIAG-VDA Process FMEA (晶粒黏著共晶Eutectic DB 1610).xlsx"
@@ -19,7 +21,7 @@ def create_exact_mapping():
     
     try:
         # Read with multi-level headers as the current parser does
-        df_multi = pd.read_excel(file_path, sheet_name=sheet_name, header=[8, 9])
+        df_multi = pd.read_excel(file_path, sheet_name=sheet_name, header=[8, 9], engine=EXCEL_ENGINE)
         
         print("First row of actual data with correct mapping:")
         print("-" * 50)
@@ -4,13 +4,14 @@ Row 9 (B9:AG9) - Main headers with merged cells
 Row 10 (B10:AG10) - Sub headers without merged cells
 """
 
-import pandas as pd
 import sys
 import os
 
 # Add the project root to sys.path so we can import from src
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+from src.parsers.excel_engine import read_sheet_rows
+
 def analyze_header_structure():
     """Analyze the exact header structure in the Excel file"""
     file_path = "docs/W-PE2169-01 潛在失效模式及後果分析AIAG-VDA Process FMEA (晶粒黏著共晶Eutectic DB 1610).xlsx"
@@ -20,37 +21,46 @@ def analyze_header_structure():
     print("=" * 60)
     
     try:
-        # Read the Excel file to analyze header structure
-        # First, read row 9 and 10 separately to understand the structure
-        
-        # Read row 9 (index 8) - Main headers
-        df_row9 = pd.read_excel(file_path, sheet_name=sheet_name, header=None, skiprows=8, nrows=1)
-        
-        # Read row 10 (index 9) - Sub headers  
-        df_row10 = pd.read_excel(file_path, sheet_name=sheet_name, header=None, skiprows=9, nrows=1)
+        # Only raw cell values are inspected, so skip DataFrame construction
+        # and read the first data row plus the header rows as plain lists
+        rows = read_sheet_rows(file_path, sheet_name, nrows=11)
+
+        # Row 9 (index 8) - Main headers; row 10 (index 9) - Sub headers
+        row9 = (rows[8] + [None] * 33)[:33]
+        row10 = (rows[9] + [None] * 33)[:33]
+
+        # Rebuild the two-level column labels read_excel(header=[8, 9])
+        # produces: merged main headers are forward-filled across their span
+        multi_columns = []
+        last_main = None
+        for i, (main, sub) in enumerate(zip(rows[8], rows[9])):
+            last_main = main if main is not None else last_main
+            multi_columns.append((
+                last_main if last_main is not None else f"Unnamed: {i}_level_0",
+                sub if sub is not None else f"Unnamed: {i}_level_1",
+            ))
+        first_data_row = rows[10] if len(rows) > 10 else None
         
         print("ROW 9 ANALYSIS (Main Headers - B9:AG9)")
         print("-" * 40)
-        print(f"Total columns in row 9: {len(df_row9.columns)}")
+        print(f"Total columns in row 9: {len(row9)}")
         
         # Print each column from B (column 1) to AG (column 32)
-        for i in range(len(df_row9.columns)):
+        for i, value in enumerate(row9):
             excel_col = chr(65 + i) if i < 26 else f"A{chr(65 + i - 26)}"
-            value = df_row9.iloc[0, i]
-            if pd.notna(value) and str(value).strip():
+            if value is not None and str(value).strip():
                 print(f"  {excel_col}{9}: '{value}'")
             else:
                 print(f"  {excel_col}{9}: [EMPTY]")
         
         print("\nROW 10 ANALYSIS (Sub Headers - B10:AG10)")
         print("-" * 40)
-        print(f"Total columns in row 10: {len(df_row10.columns)}")
+        print(f"Total columns in row 10: {len(row10)}")
         
         # Print each column from B (column 1) to AG (column 32)
-        for i in range(len(df_row10.columns)):
+        for i, value in enumerate(row10):
             excel_col = chr(65 + i) if i < 26 else f"A{chr(65 + i - 26)}"
-            value = df_row10.iloc[0, i]
-            if pd.notna(value) and str(value).strip():
+            if value is not None and str(value).strip():
                 print(f"  {excel_col}{10}: '{value}'")
             else:
                 print(f"  {excel_col}{10}: [EMPTY]")
@@ -58,12 +68,10 @@ def analyze_header_structure():
         print("\nCOMBINED HEADER STRUCTURE ANALYSIS")
         print("-" * 40)
         
-        # Now read with multi-level headers as the current parser does
-        df_multi = pd.read_excel(file_path, sheet_name=sheet_name, header=[8, 9])
-        print(f"Multi-level header columns count: {len(df_multi.columns)}")
+        print(f"Multi-level header columns count: {len(multi_columns)}")
         
         print("\nMulti-level column structure:")
-        for i, col in enumerate(df_multi.columns):
+        for i, col in enumerate(multi_columns):
             excel_col = chr(65 + i) if i < 26 else f"A{chr(65 + i - 26)}"
             print(f"  Column {i} ({excel_col}): {col}")
         
@@ -71,11 +79,10 @@ def analyze_header_structure():
         print("-" * 40)
         
         # Get first row of actual data to see what's in each column
-        if len(df_multi) > 0:
-            first_row = df_multi.iloc[0]
-            for i, (col_name, value) in enumerate(first_row.items()):
+        if first_data_row is not None:
+            for i, (col_name, value) in enumerate(zip(multi_columns, first_data_row)):
                 excel_col = chr(65 + i) if i < 26 else f"A{chr(65 + i - 26)}"
-                if pd.notna(value) and str(value).strip():
+                if value is not None and str(value).strip():
                     print(f"  {excel_col} ({col_name}): {str(value)[:50]}...")
                 else:
                     print(f"  {excel_col} ({col_name}): [EMPTY]")
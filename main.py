@@ -1,7 +1,9 @@
+import argparse
+import concurrent.futures
 import os
 from dotenv import load_dotenv
 
-from src.parsers import fmea_parser, cp_parser
+from src.parsers import fmea_parser, cp_parser, parse_cache
 from src.dify_client import client as dify_client
 from src.analyzer import comparator
 
@@ -9,6 +11,12 @@ def main():
     """
     Main function to orchestrate the FMEA, CP, and OI document analysis.
     """
+    arg_parser = argparse.ArgumentParser(description="Analyze FMEA and Control Plan workbooks.")
+    arg_parser.add_argument("--no-cache", action="store_true", help="Re-parse the workbooks instead of using the parse cache.")
+    args = arg_parser.parse_args()
+    if args.no_cache:
+        parse_cache.set_enabled(False)
+
     # 1. Load configuration from .env file
     load_dotenv()
     dify_api_key = os.getenv("DIFY_API_KEY")
@@ -30,8 +38,11 @@ def main():
 
     # 3. Parse documents
     print("\n--- Step 1: Parsing Documents ---")
-    parsed_fmea = fmea_parser.parse(fmea_file_path)
-    parsed_cp = cp_parser.parse(cp_file_path)
+    # The two workbooks are independent, so parse them concurrently
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+        future_fmea = executor.submit(fmea_parser.parse, fmea_file_path)
+        future_cp = executor.submit(cp_parser.parse, cp_file_path)
+        parsed_fmea, parsed_cp = future_fmea.result(), future_cp.result()
 
     # 4. Send data to DIFY for structuring
     print("\n--- Step 2: Structuring with DIFY AI ---")
@@ -5,7 +5,6 @@ This module exposes the available API routers.
 
 from . import (
     documents_router,
-    items_router,
     fe_router,
     auth_router,
     ai_suggestions_router,
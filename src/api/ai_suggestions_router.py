@@ -1,10 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session, joinedload
-import json
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import and_
+from sqlalchemy.orm import Session, joinedload, load_only, raiseload
+from typing import Dict, List, Optional, Tuple
+import asyncio
+import heapq
+import re
 
 from src.database import models, database
 from src.dify_client import client as dify_client
 from src.database.config import settings
+from src.utils import suggestion_cache
 
 router = APIRouter(
     prefix="/ai",
@@ -17,84 +23,190 @@ def format_fmea_item_for_prompt(item: models.FmeaItem) -> str:
 def format_cp_item_for_prompt(item: models.CpItem) -> str:
     return f"[CP Item ID: {item.id}] Characteristic: {item.product_characteristic}, Method: {item.control_method}"
 
-@router.post("/suggest-association/{fmea_item_id}")
-def suggest_association(
-    fmea_item_id: int,
-    db: Session = Depends(database.get_db)
-):
+_ID_RE = re.compile(r"\d+")
+
+# DIFY calls currently in flight, keyed like the suggestion cache
+_inflight: Dict[str, "asyncio.Future"] = {}
+
+# Catalogues larger than this are shortlisted locally before prompting, so
+# the prompt (and DIFY latency/cost) stops growing with the CP item count
+MAX_PROMPT_CANDIDATES = 50
+
+def _char_bigrams(text: str) -> set:
+    """Character bigrams of ``text``; works for both CJK and Latin wording."""
+    text = " ".join(text.lower().split())
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+def _shortlist_candidates(target, cp_items: List, limit: int = MAX_PROMPT_CANDIDATES) -> List:
     """
-    For a given FMEA item, suggests the top 3 most suitable CP items for association.
-    It excludes CP items that are already associated with the target FMEA item.
+    Keeps the ``limit`` CP items whose characteristic/method text shares the
+    most character bigrams with the target's failure mode/cause.  The AI
+    still makes the final choice; this only trims obviously unrelated rows.
+    """
+    if len(cp_items) <= limit:
+        return cp_items
+    target_grams = _char_bigrams(f"{target.failure_mode or ''} {target.failure_cause or ''}")
+    shortlist = heapq.nlargest(
+        limit,
+        cp_items,
+        key=lambda item: len(target_grams & _char_bigrams(f"{item.product_characteristic or ''} {item.control_method or ''}")),
+    )
+    # Back to id order so the prompt layout stays deterministic
+    return sorted(shortlist, key=lambda item: item.id)
+
+# The prompt is split so everything that is shared between calls (the
+# instructions, few-shot examples and CP catalogue) comes first and only the
+# target FMEA item varies at the end.  Keeping the prefix byte-identical from
+# call to call lets the LLM provider behind DIFY reuse its prompt cache.
+_PROMPT_PREFIX = """
+    You are an expert assistant for quality control in manufacturing. Your task is to find the best matches for a target FMEA item from a list of available Control Plan (CP) items.
+
+    ### EXAMPLES OF EXISTING LINKS:
+    {example_text}
+
+    ### AVAILABLE CP ITEMS (OPTIONS):
+    {options_text}
+"""
+
+_PROMPT_SUFFIX = """
+    ### TARGET FMEA ITEM:
+    {target_text}
+
+    Analyze the target FMEA item and the list of available CP items. Identify the top 3 most suitable CP Item IDs from the list. Respond with ONLY a comma-separated list of the 3 numeric IDs, ordered from the most relevant to the least relevant (e.g., 123, 456, 789).
     """
-    try:
-        # 1. Get the target FMEA item with its document info
-        target_fmea_item = db.query(models.FmeaItem).options(joinedload(models.FmeaItem.document)).filter(models.FmeaItem.id == fmea_item_id).first()
-        if not target_fmea_item:
-            raise HTTPException(status_code=404, detail="Target FMEA item not found.")
-
-        # 2. Get IDs of CP items already associated with this FMEA item to exclude them
-        associated_cp_ids = [
-            assoc.cp_item_id for assoc in
-            db.query(models.Association).filter(models.Association.fmea_item_id == fmea_item_id).all()
-        ]
-
-        # 3. Get existing associations as examples for the prompt (few-shot learning)
-        examples = db.query(models.Association).options(
-            joinedload(models.Association.fmea_item).joinedload(models.FmeaItem.document),
-            joinedload(models.Association.cp_item).joinedload(models.CpItem.document)
-        ).limit(5).all()
-        
-        example_text = "\n".join([
-            f"- Example: {format_fmea_item_for_prompt(ex.fmea_item)} IS LINKED TO {format_cp_item_for_prompt(ex.cp_item)}"
-            for ex in examples
-        ]) if examples else "No examples available."
-
-        # 4. Get all un-associated CP items as candidates
-        candidates_query = db.query(models.CpItem).options(joinedload(models.CpItem.document))
-        if associated_cp_ids:
-            candidates_query = candidates_query.filter(models.CpItem.id.notin_(associated_cp_ids))
-        cp_items = candidates_query.all()
-
-        if not cp_items:
-            return {"message": "No un-associated Control Plan items available to suggest.", "suggestions": []}
-        options_text = "\n".join([format_cp_item_for_prompt(cp_item) for cp_item in cp_items])
 
-        # 5. Construct the enhanced prompt
-        prompt = f"""
-        You are an expert assistant for quality control in manufacturing. Your task is to find the best matches for a target FMEA item from a list of available Control Plan (CP) items.
+def _build_prompt(target, candidates: List, examples: List) -> str:
+    """Renders the suggestion prompt from already-loaded rows; no DB access."""
+    example_text = "\n".join([
+        f"- Example: {format_fmea_item_for_prompt(ex.fmea_item)} IS LINKED TO {format_cp_item_for_prompt(ex.cp_item)}"
+        for ex in examples
+    ]) if examples else "No examples available."
+    options_text = "\n".join([format_cp_item_for_prompt(cp_item) for cp_item in candidates])
+    return _PROMPT_PREFIX.format(example_text=example_text, options_text=options_text) + _PROMPT_SUFFIX.format(
+        target_text=format_fmea_item_for_prompt(target)
+    )
+
+def _build_suggestion_prompt(db: Session, fmea_item_id: int) -> Optional[str]:
+    """
+    Runs the database part of :func:`suggest_association` and returns the
+    prompt, or ``None`` when there are no un-associated CP items left.
+    """
+    # 1. Get the target FMEA item (only the columns the prompt uses)
+    target_fmea_item = db.query(
+        models.FmeaItem.id, models.FmeaItem.failure_mode, models.FmeaItem.failure_cause
+    ).filter(models.FmeaItem.id == fmea_item_id).first()
+    if not target_fmea_item:
+        raise HTTPException(status_code=404, detail="Target FMEA item not found.")
+
+    # 2. Get existing associations as examples for the prompt (few-shot learning)
+    #    The prompt only uses a few item fields, so only those columns are
+    #    selected and the parent documents are not loaded; raiseload('*')
+    #    makes any accidental lazy load fail loudly.
+    examples = db.query(models.Association).options(
+        load_only(models.Association.id),
+        joinedload(models.Association.fmea_item).load_only(
+            models.FmeaItem.id, models.FmeaItem.failure_mode, models.FmeaItem.failure_cause
+        ),
+        joinedload(models.Association.cp_item).load_only(
+            models.CpItem.id, models.CpItem.product_characteristic, models.CpItem.control_method
+        ),
+        raiseload('*')
+    ).order_by(models.Association.id).limit(5).all()
+
+    # 3. Get all CP items not yet associated with this FMEA item as candidates.
+    #    A LEFT JOIN ... IS NULL anti-join excludes them in the same query
+    #    (served by the (fmea_item_id, cp_item_id) unique index) instead of
+    #    loading the associated IDs first and sending them back in a NOT IN list.
+    #    Only the three columns used by the prompt are selected, as plain rows,
+    #    rather than hydrating every TEXT column into CpItem objects.
+    cp_items = db.query(
+        models.CpItem.id, models.CpItem.product_characteristic, models.CpItem.control_method
+    ).outerjoin(
+        models.Association,
+        and_(
+            models.Association.cp_item_id == models.CpItem.id,
+            models.Association.fmea_item_id == fmea_item_id,
+        ),
+    ).filter(
+        models.Association.id.is_(None)
+    ).order_by(models.CpItem.id).all()
+
+    if not cp_items:
+        return None
+
+    # 4. Construct the enhanced prompt
+    return _build_prompt(target_fmea_item, _shortlist_candidates(target_fmea_item, cp_items), examples)
+
+async def _request_suggestions(prompt: str, cache_key: str) -> Tuple[List[int], str]:
+    """
+    Sends the prompt to DIFY and returns ``(suggested_ids, raw_response)``,
+    storing the result in the suggestion cache.
+    """
+    # 5. Call DIFY AI
+    if not settings.DIFY_API_KEY or not settings.DIFY_API_URL:
+        raise HTTPException(status_code=500, detail="DIFY API is not configured on the server.")
 
-        ### EXAMPLES OF EXISTING LINKS:
-        {example_text}
+    dify_response = await run_in_threadpool(
+        dify_client.call_text_generation, prompt, settings.DIFY_API_KEY, settings.DIFY_API_URL
+    )
 
-        ### AVAILABLE CP ITEMS (OPTIONS):
-        {options_text}
+    if dify_response['status'] != 'success':
+        raise HTTPException(status_code=502, detail=f"AI service error: {dify_response['message']}")
 
-        ### TARGET FMEA ITEM:
-        {format_fmea_item_for_prompt(target_fmea_item)}
+    # 6. Parse the AI's response to get a list of suggested IDs
+    suggested_ids_str = str(dify_response['ai_response']).strip()
+    # Take the first three integers, whatever the AI wrapped them in
+    # (spaces, brackets, "IDs: 1, 2, 3", ...)
+    suggested_ids = [int(id_str) for id_str in _ID_RE.findall(suggested_ids_str)][:3]
 
-        Analyze the target FMEA item and the list of available CP items. Identify the top 3 most suitable CP Item IDs from the list. Respond with ONLY a comma-separated list of the 3 numeric IDs, ordered from the most relevant to the least relevant (e.g., 123, 456, 789).
-        """
-        
-        # 6. Call DIFY AI
-        if not settings.DIFY_API_KEY or not settings.DIFY_API_URL:
-            raise HTTPException(status_code=500, detail="DIFY API is not configured on the server.")
+    suggestion_cache.store(cache_key, (suggested_ids, suggested_ids_str))
+    return suggested_ids, suggested_ids_str
 
-        dify_response = dify_client.call_text_generation(prompt, settings.DIFY_API_KEY, settings.DIFY_API_URL)
+async def _coalesced_suggestions(prompt: str, cache_key: str) -> Tuple[List[int], str]:
+    """
+    Runs :func:`_request_suggestions`, sharing one DIFY call between
+    concurrent requests for the same prompt (e.g. a double click or two
+    users opening the same item) instead of sending it twice.
+    """
+    task = _inflight.get(cache_key)
+    if task is None:
+        task = asyncio.ensure_future(_request_suggestions(prompt, cache_key))
+        _inflight[cache_key] = task
+        task.add_done_callback(lambda _: _inflight.pop(cache_key, None))
+    # Shield so one client disconnecting does not cancel the shared call
+    return await asyncio.shield(task)
 
-        if dify_response['status'] != 'success':
-            raise HTTPException(status_code=502, detail=f"AI service error: {dify_response['message']}")
+@router.post("/suggest-association/{fmea_item_id}")
+async def suggest_association(
+    fmea_item_id: int,
+    db: Session = Depends(database.get_db)
+):
+    """
+    For a given FMEA item, suggests the top 3 most suitable CP items for association.
+    It excludes CP items that are already associated with the target FMEA item.
 
-        # 7. Parse the AI's response to get a list of suggested IDs
-        suggested_ids_str = str(dify_response['ai_response']).strip()
-        suggested_ids = []
-        try:
-            # Clean up potential non-numeric characters and split
-            cleaned_str = ''.join(filter(lambda x: x.isdigit() or x == ',', suggested_ids_str))
-            if cleaned_str:
-                suggested_ids = [int(id_str.strip()) for id_str in cleaned_str.split(',') if id_str.strip()]
-        except (ValueError, TypeError):
-            # AI response was not in the expected format
-            pass # Keep suggested_ids as an empty list
+    The handler is async so a worker is not tied up for the multi-second
+    DIFY round-trip; the blocking ORM queries and the DIFY request run in
+    the threadpool, and the DB connection is returned to the pool before
+    the AI call starts.
+    """
+    try:
+        prompt = await run_in_threadpool(_build_suggestion_prompt, db, fmea_item_id)
+        if prompt is None:
+            return {"message": "No un-associated Control Plan items available to suggest.", "suggestions": []}
+        # Release the pooled connection; nothing below touches the database.
+        # Closing rolls back the open transaction over the blocking driver,
+        # so it runs in the threadpool too
+        await run_in_threadpool(db.close)
+
+        # The prompt captures the item, examples and candidates, so an
+        # identical prompt can be answered from the suggestion cache
+        cache_key = suggestion_cache.make_key(prompt)
+        cached = suggestion_cache.get_cached(cache_key)
+        if cached is not None:
+            suggested_ids, suggested_ids_str = cached
+        else:
+            suggested_ids, suggested_ids_str = await _coalesced_suggestions(prompt, cache_key)
 
         return {
             "message": "AI suggestions received successfully.",
@@ -102,7 +214,8 @@ def suggest_association(
             "suggestions": [
                 {"suggested_cp_item_id": sid} for sid in suggested_ids
             ],
-            "raw_ai_response": suggested_ids_str
+            "raw_ai_response": suggested_ids_str,
+            "cached": cached is not None
         }
 
     except Exception as e:
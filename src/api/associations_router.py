@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, Body
+from sqlalchemy import insert, select
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from typing import List
@@ -31,27 +32,24 @@ def create_associations(
     cp_item_ids = association_data.cp_item_ids
 
     # 1. Validate that the FMEA item exists
-    fmea_item = db.query(models.FmeaItem).filter(models.FmeaItem.id == fmea_item_id).first()
-    if not fmea_item:
+    fmea_item_exists = db.scalar(
+        select(models.FmeaItem.id).where(models.FmeaItem.id == fmea_item_id).exists().select()
+    )
+    if not fmea_item_exists:
         raise HTTPException(status_code=404, detail=f"FMEA item with id {fmea_item_id} not found.")
 
     # 2. (Transactional) Delete all existing associations for this FMEA item
     try:
         db.query(models.Association).filter(models.Association.fmea_item_id == fmea_item_id).delete()
 
-        # 3. Create new association objects
-        new_associations = []
-        for cp_id in cp_item_ids:
-            new_assoc = models.Association(
-                fmea_item_id=fmea_item_id,
-                cp_item_id=cp_id,
-                created_by=current_user.username
-            )
-            new_associations.append(new_assoc)
-        
+        # 3. Insert the new associations as one executemany INSERT
+        new_associations = [
+            {"fmea_item_id": fmea_item_id, "cp_item_id": cp_id, "created_by": current_user.username}
+            for cp_id in cp_item_ids
+        ]
         if new_associations:
-            db.bulk_save_objects(new_associations)
-        
+            db.execute(insert(models.Association), new_associations)
+
         db.commit()
         return {"message": f"Associations for FMEA item {fmea_item_id} have been updated successfully."}
     
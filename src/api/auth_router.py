@@ -1,4 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import hashlib
+import secrets
+import threading
+import time
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
@@ -28,6 +33,42 @@ class Token(BaseModel):
     access_token: str
     token_type: str
 
+# --- Login Token Cache ---
+# Clients that log in repeatedly with the same credentials get the token
+# issued moments ago instead of paying the DB lookup and bcrypt check again.
+# Keys are keyed BLAKE2b digests (random per-process key), so the cache never
+# holds anything that could be attacked offline.
+LOGIN_CACHE_TTL_SECONDS = 60
+_LOGIN_CACHE_MAX_ENTRIES = 10_000
+_login_cache_secret = secrets.token_bytes(32)
+_login_cache_lock = threading.Lock()
+_login_cache = {}  # digest -> (expires_at, token response)
+
+def _login_cache_key(username: str, password: str) -> bytes:
+    return hashlib.blake2b(
+        f"{username}\0{password}".encode("utf-8"), key=_login_cache_secret, digest_size=16
+    ).digest()
+
+def _get_cached_login(key: bytes):
+    with _login_cache_lock:
+        entry = _login_cache.get(key)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            del _login_cache[key]
+            return None
+        return entry[1]
+
+def _store_login(key: bytes, response: dict) -> None:
+    now = time.monotonic()
+    with _login_cache_lock:
+        if len(_login_cache) >= _LOGIN_CACHE_MAX_ENTRIES:
+            for stale in [k for k, (expires_at, _) in _login_cache.items() if expires_at < now]:
+                del _login_cache[stale]
+            while len(_login_cache) >= _LOGIN_CACHE_MAX_ENTRIES:
+                del _login_cache[next(iter(_login_cache))]
+        _login_cache[key] = (now + LOGIN_CACHE_TTL_SECONDS, response)
+
 # --- API Endpoints ---
 
 @router.post("/register", response_model=UserResponse)
@@ -50,19 +91,48 @@ def create_user(user: UserCreate, db: Session = Depends(database.get_db), admin_
 
 
 @router.post("/token", response_model=Token)
-def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(database.get_db)):
+def login_for_access_token(request: Request, form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(database.get_db)):
     """
     Provides a JWT token for valid user credentials.
+
+    Repeated failures for the same username and client address are refused
+    for a short window before any password hashing is done, and unknown
+    usernames cost the same bcrypt time as wrong passwords.
     """
+    cache_key = _login_cache_key(form_data.username, form_data.password)
+    cached = _get_cached_login(cache_key)
+    if cached is not None:
+        return cached
+
+    throttle_key = (form_data.username, request.client.host if request.client else None)
+    if security.login_throttled(throttle_key):
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many failed login attempts. Please try again later.",
+        )
+
     user = db.query(models.User).filter(models.User.username == form_data.username).first()
-    if not user or not security.verify_password(form_data.password, user.hashed_password):
+    if user is None:
+        authenticated = security.verify_password_for_unknown_user(form_data.password)
+    else:
+        authenticated = security.verify_password(form_data.password, user.hashed_password)
+    if not authenticated:
+        security.record_failed_login(throttle_key)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    security.reset_failed_logins(throttle_key)
+    if security.password_needs_rehash(user.hashed_password):
+        # Move the stored hash to the configured BCRYPT_ROUNDS now that the
+        # plain password is known to be correct
+        user.hashed_password = security.get_password_hash(form_data.password)
+        db.commit()
     access_token = security.create_access_token(
         data={"sub": user.username, "role": user.role}
     )
-    return {"access_token": access_token, "token_type": "bearer"}
+    token_response = {"access_token": access_token, "token_type": "bearer"}
+    _store_login(cache_key, token_response)
+    return token_response
@@ -8,21 +8,34 @@ returned in responses are converted from UTC to the Asia/Taipei timezone using
 the helper in `src.utils.time_utils`.
 """
 
-import io
+import functools
+import itertools
 import json
 import logging
 import traceback
 from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, Form
-from sqlalchemy.orm import Session, joinedload
-import pandas as pd  # Used by the parsers
-from datetime import datetime
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from sqlalchemy import insert, inspect, select
+from sqlalchemy.orm import Session, joinedload, raiseload
+import pandas as pd  # Used to open uploaded workbooks
+from datetime import date, datetime
 
 from src.database import models, database
+from src.database.config import settings
 from src.parsers import fmea_parser, cp_parser
+from src.parsers._workbook_cache import fileobj_digest, sheet_names_for_fileobj
+from src.parsers.excel_engine import EXCEL_ENGINE
 from src.utils import fe_list_parser
 from src.utils.time_utils import to_local
 from src import security # Import the new security module
 
+# orjson is optional; the detail stream falls back to the stdlib encoder
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -31,6 +44,49 @@ router = APIRouter(
     tags=["Documents"],
 )
 
+_ALLOWED_CONTENT_TYPES = frozenset({
+    'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    'application/vnd.ms-excel',
+})
+_ALLOWED_DOCUMENT_TYPES = frozenset({'FMEA', 'CP'})
+
+def _bulk_insert(db: Session, model, rows) -> None:
+    """
+    Inserts plain dictionaries with executemany INSERTs, skipping the per-row
+    ORM object construction and identity-map bookkeeping.  ``rows`` may be
+    any iterable; it is consumed in batches of ``DB_INSERT_BATCH_SIZE`` so
+    only one batch of insert payloads is held in memory at a time.
+    """
+    rows = iter(rows)
+    while batch := list(itertools.islice(rows, settings.DB_INSERT_BATCH_SIZE)):
+        db.execute(insert(model), batch)
+
+_JS_MONTHS = {
+    month: number
+    for number, month in enumerate(
+        ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"), start=1
+    )
+}
+
+@functools.lru_cache(maxsize=256)
+def _parse_form_date(value: str) -> str:
+    """
+    Converts a date form field to ``YYYY-MM-DD``.  ISO-8601 input takes the
+    ``fromisoformat`` path; anything else must be a JavaScript
+    ``Date.toString()`` value such as ``Tue Jan 02 2024 00:00:00 GMT+0800 (Taipei Standard Time)``,
+    whose calendar date is read straight from its fields.  Raises
+    ``ValueError`` for other layouts.
+    """
+    try:
+        return datetime.fromisoformat(value.strip()).strftime('%Y-%m-%d')
+    except ValueError:
+        pass
+    # Only the date part is kept, so the time and zone fields need no parsing
+    parts = value.split()
+    if len(parts) < 4 or parts[1] not in _JS_MONTHS:
+        raise ValueError(f"time data {value!r} is not an ISO-8601 or JavaScript date")
+    return date(int(parts[3]), _JS_MONTHS[parts[1]], int(parts[2])).isoformat()
+
 @router.post("/upload")
 def upload_document(
     file: UploadFile = File(...),
@@ -58,18 +114,64 @@ def upload_document(
     try:
         logger.info(f"Received upload request for document type: {document_type}")
         # Validate content type
-        if file.content_type not in [
-            'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-            'application/vnd.ms-excel'
-        ]:
+        if file.content_type not in _ALLOWED_CONTENT_TYPES:
             raise HTTPException(status_code=400, detail="Invalid file type. Please upload an Excel file.")
 
-        if document_type.upper() not in ['FMEA', 'CP']:
+        if document_type.upper() not in _ALLOWED_DOCUMENT_TYPES:
             raise HTTPException(status_code=400, detail="Invalid document_type. Must be 'FMEA' or 'CP'.")
 
-        # Read file content into a pandas-readable format
-        file_content = file.file.read()
-        file_like_object = io.BytesIO(file_content)
+        # UploadFile is already backed by a SpooledTemporaryFile, so parse
+        # straight from it instead of copying the whole upload into BytesIO
+        upload_stream = file.file
+
+        # Check the expected worksheet is present before touching the
+        # database.  Sheet names and parse results are cached by content
+        # hash, so re-uploading an identical workbook neither opens it again
+        # here nor parses it again below.
+        required_sheet = '00' if document_type.upper() == 'FMEA' else 'REV.04'
+        try:
+            content_digest = fileobj_digest(upload_stream)
+            available_sheets = sheet_names_for_fileobj(upload_stream, content_digest)
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=f"Unable to read Excel workbook: {e}")
+        if required_sheet not in available_sheets:
+            raise HTTPException(status_code=400, detail=f"Worksheet '{required_sheet}' not found in uploaded {document_type.upper()} file.")
+
+        # The user lookup left this session holding a pooled connection.
+        # Hand it back while the workbook is parsed, which can take seconds
+        # on a large file; the transaction below checks out a fresh one.
+        uploaded_by = current_user.username
+        db.close()
+
+        # Parse everything before the transaction starts, so no connection
+        # or open transaction is held during the CPU-bound part.  The
+        # workbook is opened once; the item and FE-list parsers both read
+        # their sheets from this handle.
+        workbook = pd.ExcelFile(upload_stream, engine=EXCEL_ENGINE)
+        try:
+            if document_type.upper() == 'FMEA':
+                # Parse the FMEA data
+                parsed_result = fmea_parser.parse(workbook, content_digest=content_digest)
+                if parsed_result.get('status') != 'success':
+                    raise HTTPException(status_code=500, detail=f"Failed to parse FMEA file: {parsed_result.get('message')}")
+
+                try:
+                    start_date = _parse_form_date(pfmea_start_date) if pfmea_start_date and pfmea_start_date.strip() != "" else None
+                    revision_date = _parse_form_date(pfmea_revision_date) if pfmea_revision_date and pfmea_revision_date.strip() != "" else None
+                except ValueError as e:
+                    logger.error(f"Date parsing error: {e}")
+                    raise HTTPException(status_code=400, detail=f"Invalid date format: {e}. Please use YYYY-MM-DD.")
+
+                # Parse the FE list
+                fe_parse_result = fe_list_parser.parse(workbook, content_digest=content_digest)
+            else:
+                # Parse the CP data
+                parsed_result = cp_parser.parse(workbook, content_digest=content_digest)
+                if parsed_result.get('status') != 'success':
+                    raise HTTPException(status_code=500, detail=f"Failed to parse CP file: {parsed_result.get('message')}")
+        finally:
+            workbook.close()
+        parsed_items = parsed_result.get('data', [])
 
         # --- Database Transaction ---
         try:
@@ -77,25 +179,13 @@ def upload_document(
             new_document = models.Document(
                 file_name=file.filename,
                 document_type=document_type.upper(),
-                uploaded_by=current_user.username
+                uploaded_by=uploaded_by
             )
             db.add(new_document)
             db.flush()  # Flush to get the new_document.id for the items
 
             if document_type.upper() == 'FMEA':
-                # Parse the FMEA data
-                parsed_result = fmea_parser.parse(file_like_object)
-                if parsed_result.get('status') != 'success':
-                    raise HTTPException(status_code=500, detail=f"Failed to parse FMEA file: {parsed_result.get('message')}")
-                
                 # Create FMEA header and items
-                try:
-                    start_date = datetime.strptime(pfmea_start_date, '%a %b %d %Y %H:%M:%S GMT%z (%Z)').strftime('%Y-%m-%d') if pfmea_start_date and pfmea_start_date.strip() != "" else None
-                    revision_date = datetime.strptime(pfmea_revision_date, '%a %b %d %Y %H:%M:%S GMT%z (%Z)').strftime('%Y-%m-%d') if pfmea_revision_date and pfmea_revision_date.strip() != "" else None
-                except ValueError as e:
-                    logger.error(f"Date parsing error: {e}")
-                    raise HTTPException(status_code=400, detail=f"Invalid date format: {e}. Please use YYYY-MM-DD.")
-
                 header_data = {
                     "company_name": company_name,
                     "customer_name": customer_name,
@@ -113,34 +203,24 @@ def upload_document(
                 fmea_header = models.FmeaHeader(document_id=new_document.id, **header_data)
                 db.add(fmea_header)
 
-                items_to_create = []
-                for i, record in enumerate(parsed_result.get('data', [])):
-                    item = models.FmeaItem(document_id=new_document.id, row_index=i, **record)
-                    items_to_create.append(item)
-                db.bulk_save_objects(items_to_create)
+                _bulk_insert(db, models.FmeaItem, (
+                    {"document_id": new_document.id, "row_index": i, **record}
+                    for i, record in enumerate(parsed_items)
+                ))
 
-                # Parse and store FE items
-                file_like_object.seek(0)
-                fe_parse_result = fe_list_parser.parse(file_like_object)
+                # Store FE items
                 if fe_parse_result.get('status') == 'success':
-                    fe_items_to_create = []
-                    for record in fe_parse_result.get('data', []):
-                        item = models.FmeaFeItem(document_id=new_document.id, **record)
-                        fe_items_to_create.append(item)
-                    db.bulk_save_objects(fe_items_to_create)
-
-            elif document_type.upper() == 'CP':
-                # Parse the CP data
-                parsed_result = cp_parser.parse(file_like_object)
-                if parsed_result.get('status') != 'success':
-                    raise HTTPException(status_code=500, detail=f"Failed to parse CP file: {parsed_result.get('message')}")
+                    _bulk_insert(db, models.FmeaFeItem, (
+                        {"document_id": new_document.id, **record}
+                        for record in fe_parse_result.get('data', [])
+                    ))
 
+            else:
                 # Create CP items
-                items_to_create = []
-                for i, record in enumerate(parsed_result.get('data', [])):
-                    item = models.CpItem(document_id=new_document.id, row_index=i, **record)
-                    items_to_create.append(item)
-                db.bulk_save_objects(items_to_create)
+                _bulk_insert(db, models.CpItem, (
+                    {"document_id": new_document.id, "row_index": i, **record}
+                    for i, record in enumerate(parsed_items)
+                ))
 
             db.commit()
             db.refresh(new_document)
@@ -149,7 +229,7 @@ def upload_document(
                 "message": "Document uploaded and processed successfully",
                 "document_id": new_document.id,
                 "file_name": new_document.file_name,
-                "items_created": len(items_to_create),
+                "items_created": len(parsed_items),
                 "created_at": to_local(new_document.created_at),
                 "updated_at": to_local(new_document.updated_at)
             }
@@ -157,6 +237,9 @@ def upload_document(
             logger.error(f"Database error during upload: {e}", exc_info=True)
             db.rollback()
             raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+    except HTTPException:
+        # Allow HTTPException to propagate unchanged
+        raise
     except Exception as e:
         logger.error(f"An unexpected error occurred: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"An unexpected error occurred: {traceback.format_exc()}")
@@ -169,23 +252,66 @@ def list_documents(db: Session = Depends(database.get_db), current_user: models.
     document’s timestamps are converted to the Asia/Taipei timezone.
     """
     try:
-        documents = db.query(models.Document).order_by(models.Document.created_at.desc()).all()
-        results = []
-        for doc in documents:
-            results.append({
-                "id": doc.id,
-                "file_name": doc.file_name,
-                "document_type": doc.document_type,
-                "version": doc.version,
-                "uploaded_by": doc.uploaded_by,
-                "created_at": to_local(doc.created_at),
-                "updated_at": to_local(doc.updated_at)
-            })
-        return results
+        # Plain column rows: no ORM objects or identity-map entries are needed
+        # just to format the list
+        stmt = select(
+            models.Document.id,
+            models.Document.file_name,
+            models.Document.document_type,
+            models.Document.version,
+            models.Document.uploaded_by,
+            models.Document.created_at,
+            models.Document.updated_at,
+        ).order_by(models.Document.created_at.desc())
+        return [
+            {
+                **doc,
+                "created_at": to_local(doc["created_at"]),
+                "updated_at": to_local(doc["updated_at"])
+            }
+            for doc in db.execute(stmt).mappings()
+        ]
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
 
 
+def _dumps(obj) -> bytes:
+    """
+    Compact UTF-8 JSON for the streamed document details.  Uses orjson when
+    it is installed, falling back to FastAPI's encoder for types orjson does
+    not handle natively; otherwise the stdlib encoder is used.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=jsonable_encoder)
+    return json.dumps(jsonable_encoder(obj), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _stream_document_details(result: dict, items_key: str, item_model, document_id: int):
+    """
+    Yields the document details JSON in pieces: the document fields first,
+    then one item at a time as rows are fetched in batches, so a large
+    document is never held in memory as a full list or a single JSON string.
+
+    The items are read on a session of their own, opened here and closed
+    when the stream ends, because the request's session may already be
+    closed by the time the response body is sent.  Once streaming has
+    started the status line is gone, so a database error mid-stream ends
+    the response as a truncated 200 body rather than a 500.
+    """
+    head = _dumps(result)
+    yield head[:-1] + f',"{items_key}":['.encode("utf-8")
+    column_keys = [column.key for column in inspect(item_model).column_attrs]
+    db = database.SessionLocal()
+    try:
+        items_query = db.query(item_model).filter(item_model.document_id == document_id).order_by(item_model.id)
+        for i, item in enumerate(items_query.yield_per(500)):
+            item_json = _dumps({key: getattr(item, key) for key in column_keys})
+            yield item_json if i == 0 else b"," + item_json
+    finally:
+        db.close()
+    yield b"]}"
+
+
 @router.get("/{document_id}")
 def get_document_details(document_id: int, db: Session = Depends(database.get_db), current_user: models.User = Depends(security.get_current_user)):
     """
@@ -194,11 +320,14 @@ def get_document_details(document_id: int, db: Session = Depends(database.get_db
     timezone.
     """
     try:
-        document = db.query(models.Document).options(
-            joinedload(models.Document.fmea_header),
-            joinedload(models.Document.fmea_items),
-            joinedload(models.Document.cp_items)
-        ).filter(models.Document.id == document_id).first()
+        # Only the document and its header are loaded here; the items are
+        # streamed below.  raiseload('*') turns any other relationship access
+        # into an error instead of a lazy query.
+        document = db.get(
+            models.Document,
+            document_id,
+            options=[joinedload(models.Document.fmea_header), raiseload('*')],
+        )
 
         if not document:
             raise HTTPException(status_code=404, detail="Document not found")
@@ -228,11 +357,16 @@ def get_document_details(document_id: int, db: Session = Depends(database.get_db
                     'cross_functional_team': document.fmea_header.cross_functional_team,
                     'confidentiality_level': document.fmea_header.confidentiality_level
                 }
-            result['fmea_items'] = document.fmea_items
+            items_key, item_model = 'fmea_items', models.FmeaItem
         elif document.document_type == 'CP':
-            result['cp_items'] = document.cp_items
+            items_key, item_model = 'cp_items', models.CpItem
+        else:
+            return result
 
-        return result
+        return StreamingResponse(
+            _stream_document_details(result, items_key, item_model, document.id),
+            media_type="application/json",
+        )
     except HTTPException:
         # Allow HTTPException to propagate unchanged
         raise
@@ -1,18 +1,80 @@
-import io
-import pandas as pd
+import itertools
+import operator
+import os
+import tempfile
 from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import StreamingResponse
-from sqlalchemy.orm import Session, joinedload
+from fastapi.responses import FileResponse
+from starlette.background import BackgroundTask
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
 
 from src.database import models, database
 from src import security
 
+# xlsxwriter is the faster writer; openpyxl (already required for reading)
+# is the fallback when it is not installed
+try:
+    import xlsxwriter
+except ImportError:
+    xlsxwriter = None
+
 router = APIRouter(
     prefix="/export",
     tags=["Exporting"],
 )
 
-@router.get("/{document_id}", response_class=StreamingResponse)
+EXPORT_COLUMNS = [
+    'FMEA Item ID',
+    'Process Step',
+    'Process Function',
+    'Failure Mode',
+    'Failure Cause',
+    'Prevention Controls',
+    'Detection Controls',
+    'Severity',
+    'Occurrence',
+    'Detection',
+    'AP',
+    'Associated Control Plan Items',
+]
+
+def _write_xlsx(output: str, sheet_name: str, rows) -> int:
+    """
+    Writes ``EXPORT_COLUMNS`` and then ``rows`` to a single-sheet workbook in
+    ``output`` and returns the number of data rows written.
+
+    Rows are written one at a time in streaming mode (xlsxwriter's
+    ``constant_memory`` or openpyxl's write-only workbook), so memory use does
+    not grow with the number of items exported.
+    """
+    count = 0
+    if xlsxwriter is not None:
+        workbook = xlsxwriter.Workbook(output, {'constant_memory': True})
+        worksheet = workbook.add_worksheet(sheet_name)
+        worksheet.write_row(0, 0, EXPORT_COLUMNS, workbook.add_format({'bold': True, 'border': 1}))
+        for count, row in enumerate(rows, start=1):
+            worksheet.write_row(count, 0, row)
+        workbook.close()
+        return count
+
+    workbook = Workbook(write_only=True)
+    worksheet = workbook.create_sheet(sheet_name)
+    header = []
+    for title in EXPORT_COLUMNS:
+        cell = WriteOnlyCell(worksheet, value=title)
+        cell.font = Font(bold=True)
+        header.append(cell)
+    worksheet.append(header)
+    for count, row in enumerate(rows, start=1):
+        worksheet.append(row)
+    workbook.save(output)
+    return count
+
+@router.get("/{document_id}", response_class=FileResponse)
 def export_document_to_excel(
     document_id: int,
     db: Session = Depends(database.get_db),
@@ -23,71 +85,67 @@ def export_document_to_excel(
     with Control Plan items, into a formatted Excel file.
     """
     # 1. Fetch the document and ensure it's an FMEA document
-    document = db.query(models.Document).options(
-        joinedload(models.Document.fmea_items),
-        joinedload(models.Document.fmea_header)
-    ).filter(models.Document.id == document_id).first()
+    #    (only the two columns used below)
+    document = db.execute(
+        select(models.Document.document_type, models.Document.file_name).where(models.Document.id == document_id)
+    ).first()
 
     if not document:
         raise HTTPException(status_code=404, detail="Document not found")
     if document.document_type != 'FMEA':
         raise HTTPException(status_code=400, detail="Export is only supported for FMEA documents.")
 
-    fmea_item_ids = [item.id for item in document.fmea_items]
-
-    # 2. Fetch all associations for the items in this document
-    associations = db.query(models.Association).options(
-        joinedload(models.Association.cp_item)
-    ).filter(models.Association.fmea_item_id.in_(fmea_item_ids)).all()
-
-    # 3. Create a map for easy lookup: {fmea_item_id: [list of cp_items]}
-    assoc_map = {fmea_id: [] for fmea_id in fmea_item_ids}
-    for assoc in associations:
-        if assoc.cp_item:
-            assoc_map[assoc.fmea_item_id].append(assoc.cp_item)
+    # 2. Fetch the items together with their associated CP items in one
+    #    query.  Items without associations come back once with a None CP
+    #    item; ordering by item id keeps each item's rows adjacent for groupby.
+    rows = db.execute(
+        select(models.FmeaItem, models.CpItem)
+        .outerjoin(models.Association, models.Association.fmea_item_id == models.FmeaItem.id)
+        .outerjoin(models.CpItem, models.CpItem.id == models.Association.cp_item_id)
+        .where(models.FmeaItem.document_id == document_id)
+        .order_by(models.FmeaItem.id, models.Association.id)
+    )
 
-    # 4. Prepare data for DataFrame
-    export_data = []
-    for item in document.fmea_items:
-        row_data = {
-            'FMEA Item ID': item.id,
-            'Process Step': item.process_step,
-            'Process Function': item.process_function,
-            'Failure Mode': item.failure_mode,
-            'Failure Cause': item.failure_cause,
-            'Prevention Controls': item.prevention_controls,
-            'Detection Controls': item.detection_controls,
-            'Severity': item.severity,
-            'Occurrence': item.occurrence,
-            'Detection': item.detection,
-            'AP': item.ap
-        }
-
-        # Format associated CP items into a single string
-        linked_cps = assoc_map.get(item.id, [])
-        cp_strings = []
-        for cp_item in linked_cps:
-            cp_strings.append(
+    # 3. Format one spreadsheet row per FMEA item, with its associated CP
+    #    items combined into a single cell
+    def export_rows():
+        for item, item_rows in itertools.groupby(rows, key=operator.itemgetter(0)):
+            linked_cps = "\n".join(
                 f"[ID: {cp_item.id}] {cp_item.product_characteristic} - {cp_item.control_method}"
+                for _, cp_item in item_rows if cp_item is not None
             )
-        
-        row_data['Associated Control Plan Items'] = "\n".join(cp_strings) if cp_strings else "None"
-        export_data.append(row_data)
-
-    if not export_data:
-        raise HTTPException(status_code=404, detail="No valid FMEA items found in the document to export.")
-
-    # 5. Create Excel file in memory
-    df = pd.DataFrame(export_data)
-    
-    output = io.BytesIO()
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-        df.to_excel(writer, index=False, sheet_name=f'FMEA_{document_id}_Export')
-    output.seek(0)
+            yield [
+                item.id,
+                item.process_step,
+                item.function_of_process_item,
+                item.failure_mode,
+                item.failure_cause,
+                item.prevention_controls_description,
+                item.detection_controls,
+                item.severity,
+                item.occurrence,
+                item.detection,
+                item.ap,
+                linked_cps or "None",
+            ]
 
-    # 6. Return as a downloadable file
-    headers = {
-        'Content-Disposition': f'attachment; filename="{document.file_name}_export.xlsx"'
-    }
+    # 4. Write the Excel file to a temporary file, streaming rows straight
+    #    from the query, so neither the rows nor the workbook bytes are held
+    #    in memory
+    with tempfile.NamedTemporaryFile(suffix='.xlsx', delete=False) as tmp:
+        tmp_path = tmp.name
+    try:
+        if not _write_xlsx(tmp_path, f'FMEA_{document_id}_Export', export_rows()):
+            raise HTTPException(status_code=404, detail="No valid FMEA items found in the document to export.")
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
 
-    return StreamingResponse(output, headers=headers, media_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
\ No newline at end of file
+    # 5. Return as a downloadable file; FileResponse sends it with sendfile()
+    #    where available and the file is removed once the response is done
+    return FileResponse(
+        tmp_path,
+        filename=f"{document.file_name}_export.xlsx",
+        media_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+        background=BackgroundTask(os.unlink, tmp_path),
+    )
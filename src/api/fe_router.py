@@ -11,6 +11,7 @@ severity value.
 """
 
 from fastapi import APIRouter, Depends, HTTPException, Path
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from src.database import models, database
@@ -34,22 +35,35 @@ def get_fe_options(
     Returns a list of objects with ``id`` (item id), ``failure_effect`` and
     ``severity``.  Timestamps are also provided for auditing.
     """
-    # Fetch the document
-    document = db.query(models.Document).filter(models.Document.id == document_id).first()
-    if not document:
+    # Only the document type is needed to validate the request
+    document_type = db.scalar(
+        select(models.Document.document_type).where(models.Document.id == document_id)
+    )
+    if document_type is None:
         raise HTTPException(status_code=404, detail="Document not found")
-    if document.document_type != 'FMEA':
+    if document_type != 'FMEA':
         raise HTTPException(status_code=400, detail="Failure Effects are only defined for FMEA documents")
 
-    options = []
-    for item in document.fmea_fe_items:
-        options.append({
+    # Sorted by severity descending then alphabetically for consistency; the
+    # (document_id, severity) index serves both the filter and the sort.
+    # Plain column rows are enough to build the response.
+    fe_items = db.query(
+        models.FmeaFeItem.id,
+        models.FmeaFeItem.failure_effect,
+        models.FmeaFeItem.severity,
+        models.FmeaFeItem.created_at,
+        models.FmeaFeItem.updated_at,
+    ).filter(
+        models.FmeaFeItem.document_id == document_id
+    ).order_by(models.FmeaFeItem.severity.desc(), models.FmeaFeItem.failure_effect.asc())
+
+    return [
+        {
             'item_id': item.id,
             'failure_effect': item.failure_effect,
             'severity': item.severity,
             'created_at': to_local(item.created_at),
             'updated_at': to_local(item.updated_at)
-        })
-    # Sort options by severity descending then alphabetically for consistency
-    options.sort(key=lambda x: (-x['severity'], x['failure_effect']))
-    return options
+        }
+        for item in fe_items
+    ]
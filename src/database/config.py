@@ -1,4 +1,14 @@
-from pydantic_settings import BaseSettings
+from functools import lru_cache
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+# mysqlclient (MySQLdb) decodes the wire protocol in C; it needs the MySQL
+# client libraries to build, so PyMySQL stays the pure-Python fallback
+try:
+    import MySQLdb  # noqa: F401
+    MYSQL_DRIVER = "mysqldb"
+except ImportError:
+    MYSQL_DRIVER = "pymysql"
 
 class Settings(BaseSettings):
     """
@@ -10,6 +20,11 @@ class Settings(BaseSettings):
     DB_USER: str = "root"
     DB_PASSWORD: str = ""
     DB_NAME: str = "db_A060"
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 40
+    DB_POOL_RECYCLE: int = 1800  # seconds; below MySQL's default wait_timeout
+    DB_POOL_TIMEOUT: int = 30  # seconds to wait for a free pooled connection
+    DB_INSERT_BATCH_SIZE: int = 1000  # rows per INSERT statement on upload
 
     # DIFY AI Settings
     DIFY_API_KEY: str = ""
@@ -17,18 +32,28 @@ class Settings(BaseSettings):
 
     # Security & Initial Admin User
     SECRET_KEY: str = "change_this_secret_key_in_production"
+    BCRYPT_ROUNDS: int = 12  # cost of new password hashes; older hashes are upgraded on login
     ADMIN_USERNAME: str = "admin"
     ADMIN_PASSWORD: str = "admin"
 
     @property
     def DATABASE_URL(self) -> str:
         """
-        Constructs the SQLAlchemy database URL using the 'pymysql' driver.
+        Constructs the SQLAlchemy database URL using the 'mysqldb' driver
+        (mysqlclient) when it is installed, otherwise 'pymysql'.
         """
-        return f"mysql+pymysql://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}?charset=utf8mb4"
+        return f"mysql+{MYSQL_DRIVER}://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}?charset=utf8mb4"
+
+    # Settings are read once and never modified at runtime
+    model_config = SettingsConfigDict(env_file=".env", env_file_encoding='utf-8', frozen=True)
 
-    class Config:
-        env_file = ".env"
-        env_file_encoding = 'utf-8'
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Returns the process-wide settings, reading the environment and ``.env``
+    only on the first call.  Can be used as a FastAPI dependency and
+    overridden in tests.
+    """
+    return Settings()
 
-settings = Settings()
+settings = get_settings()
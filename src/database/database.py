@@ -4,8 +4,18 @@ from sqlalchemy.orm import sessionmaker
 
 from .config import settings
 
-# Create the SQLAlchemy engine using the URL from our settings
-engine = create_engine(settings.DATABASE_URL)
+# Create the SQLAlchemy engine using the URL from our settings.  The pool is
+# sized well above SQLAlchemy's default of 5 + 10 overflow so slow requests
+# (large uploads, exports) cannot exhaust it; pre-ping and recycle drop
+# connections the MySQL server has already closed.
+engine = create_engine(
+    settings.DATABASE_URL,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_pre_ping=True,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+)
 
 # Create a SessionLocal class. Each instance of a SessionLocal will be a database session.
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
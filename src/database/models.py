@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Enum, JSON, TIMESTAMP, ForeignKey, UniqueConstraint, TEXT, DATE
+from sqlalchemy import Column, Integer, String, Enum, JSON, TIMESTAMP, ForeignKey, UniqueConstraint, Index, TEXT, DATE
 from sqlalchemy.dialects.mysql import TINYINT
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -16,6 +16,9 @@ class Document(Base):
     created_at = Column(TIMESTAMP, server_default=func.now())
     updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
 
+    # Backs the newest-first ORDER BY in the document list
+    __table_args__ = (Index('idx_documents_created_at', 'created_at'),)
+
     fmea_header = relationship('FmeaHeader', back_populates='document', uselist=False, cascade='all, delete-orphan')
     fmea_items = relationship('FmeaItem', back_populates='document', cascade='all, delete-orphan')
     fmea_fe_items = relationship('FmeaFeItem', back_populates='document', cascade='all, delete-orphan')
@@ -90,6 +93,7 @@ class FmeaItem(Base):
 
 class FmeaFeItem(Base):
     __tablename__ = 'fmcp_fmea_fe_items'
+    __table_args__ = (Index('idx_fe_items_document_severity', 'document_id', 'severity'),)
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     document_id = Column(Integer, ForeignKey('fmcp_documents.id', ondelete='CASCADE'), nullable=False)
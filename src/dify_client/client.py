@@ -1,5 +1,17 @@
 import requests
-import json
+from requests.adapters import HTTPAdapter
+
+# Shared session so repeated DIFY calls reuse the pooled keep-alive
+# connection instead of paying a new TCP/TLS handshake each time.  The pool
+# is sized for concurrent suggestion requests running in the threadpool.
+_session = requests.Session()
+_adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20)
+_session.mount("https://", _adapter)
+_session.mount("http://", _adapter)
+
+# (connect, read) seconds; blocking-mode workflows can take a while to answer,
+# but a dead connection should not hold a worker thread forever
+REQUEST_TIMEOUT = (5, 120)
 
 def call_text_generation(prompt: str, api_key: str, base_api_url: str) -> dict:
     """
@@ -30,7 +42,7 @@ def call_text_generation(prompt: str, api_key: str, base_api_url: str) -> dict:
     }
 
     try:
-        response = requests.post(workflow_url, json=payload, headers=headers)
+        response = _session.post(workflow_url, json=payload, headers=headers, timeout=REQUEST_TIMEOUT)
         response.raise_for_status()
         
         ai_response = response.json()
@@ -0,0 +1,83 @@
+"""
+Cached workbook metadata lookups.
+
+Opening a workbook just to list its sheets still means reading the zip
+central directory and the workbook part.  The helpers below memoize the
+sheet names so repeated checks of the same file are nearly free: paths are
+keyed on ``(path, mtime, size)`` and uploaded streams on the SHA‑1 of
+their content.
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import BinaryIO, Optional, Tuple
+
+import pandas as pd
+
+from src.parsers.excel_engine import EXCEL_ENGINE
+
+_MAX_ENTRIES = 128
+_names_lock = threading.Lock()
+_names_by_digest: "OrderedDict[str, Tuple[str, ...]]" = OrderedDict()
+
+
+@functools.lru_cache(maxsize=_MAX_ENTRIES)
+def sheet_names(path: str, mtime: float, size: int) -> Tuple[str, ...]:
+    """Return the sheet names of the workbook at ``path``.
+
+    ``mtime`` and ``size`` are only part of the cache key so that a file
+    modified on disk is read again.
+    """
+    with pd.ExcelFile(path, engine=EXCEL_ENGINE) as xl:
+        return tuple(xl.sheet_names)
+
+
+def sheet_names_for_path(path: str) -> Tuple[str, ...]:
+    """Convenience wrapper that fills in the ``mtime``/``size`` cache key."""
+    return sheet_names(path, os.path.getmtime(path), os.path.getsize(path))
+
+
+def fileobj_digest(fh: BinaryIO) -> str:
+    """Return the SHA‑1 of an open workbook stream's content.
+
+    The stream is hashed in chunks rather than read into memory, and is
+    rewound to the start before returning so callers can parse it next.
+    """
+    fh.seek(0)
+    digest = hashlib.sha1()
+    for chunk in iter(lambda: fh.read(1 << 20), b""):
+        digest.update(chunk)
+    fh.seek(0)
+    return digest.hexdigest()
+
+
+def sheet_names_for_fileobj(fh: BinaryIO, digest: Optional[str] = None) -> Tuple[str, ...]:
+    """Return the sheet names of an open workbook stream, cached by content hash.
+
+    ``digest`` is the stream's :func:`fileobj_digest`; it is computed here
+    when the caller has not already done so.  The stream is left rewound.
+    """
+    key = digest if digest is not None else fileobj_digest(fh)
+
+    with _names_lock:
+        names = _names_by_digest.get(key)
+        if names is not None:
+            _names_by_digest.move_to_end(key)
+            return names
+
+    try:
+        with pd.ExcelFile(fh, engine=EXCEL_ENGINE) as xl:
+            names = tuple(xl.sheet_names)
+    finally:
+        fh.seek(0)
+    with _names_lock:
+        _names_by_digest[key] = names
+        _names_by_digest.move_to_end(key)
+        if len(_names_by_digest) > _MAX_ENTRIES:
+            _names_by_digest.popitem(last=False)
+    return names
@@ -25,10 +25,12 @@ file‑like object that ``pandas.read_excel`` can consume (e.g. a
 
 from __future__ import annotations
 
-import re
 import pandas as pd
 from typing import Any, Dict, List, Union
 
+from src.parsers.excel_engine import EXCEL_ENGINE
+from src.parsers.parse_cache import cache_df
+
 
 def _flatten_columns(columns: pd.MultiIndex) -> List[str]:
     """Flatten a pandas MultiIndex into single strings.
@@ -40,28 +42,26 @@ def _flatten_columns(columns: pd.MultiIndex) -> List[str]:
     """
     flattened: List[str] = []
     for col in columns:
-        parts: List[str] = []
-        for level in col:
-            if level is None:
-                continue
-            level_str = str(level).strip()
-            if not level_str or level_str.startswith("Unnamed"):
-                continue
-            # Replace all whitespace (including newlines) with single spaces
-            level_str = re.sub(r"\s+", " ", level_str)
-            parts.append(level_str)
-        flattened.append(" ".join(parts))
+        # ``" ".join(s.split())`` strips and collapses whitespace (including
+        # newlines) in one pass without going through the regex engine
+        levels = (" ".join(str(level).split()) for level in col if level is not None)
+        flattened.append(" ".join(part for part in levels if part and not part.startswith("Unnamed")))
     return flattened
 
 
-def parse(file_source: Union[str, Any]) -> Dict[str, Any]:
+@cache_df()
+def parse(file_source: Union[str, Any], engine: str = EXCEL_ENGINE) -> Dict[str, Any]:
     """Parse a Control Plan Excel file and extract structured records.
 
     Parameters
     ----------
     file_source : Union[str, Any]
-        The path to a ``.xlsx`` file or a file‑like object containing
-        the workbook.
+        The path to a ``.xlsx`` file, a file‑like object containing
+        the workbook, or an already open ``pd.ExcelFile``.
+    engine : str
+        The ``pandas.read_excel`` engine.  Defaults to ``calamine`` when
+        ``python-calamine`` is installed and ``openpyxl`` otherwise.  It
+        must match the engine of an ``ExcelFile`` passed as the source.
 
     Returns
     -------
@@ -79,6 +79,7 @@ def parse(file_source: Union[str, Any]) -> Dict[str, Any]:
             file_source,
             sheet_name=target_sheet,
             header=header_rows,
+            engine=engine,
         )
     except Exception as exc:
         return {"status": "error", "message": f"Failed to read Excel: {exc}"}
@@ -113,23 +114,21 @@ def parse(file_source: Union[str, Any]) -> Dict[str, Any]:
     records_df = pd.DataFrame(extracted)
 
     # Forward‑fill hierarchical fields to handle merged cells
-    for col in ["process_name", "product_characteristic", "process_characteristic"]:
-        if col in records_df.columns:
-            records_df[col] = records_df[col].ffill()
+    hierarchical = ["process_name", "product_characteristic", "process_characteristic"]
+    records_df[hierarchical] = records_df[hierarchical].ffill()
 
-    # Filter out rows without a product characteristic (blank or containing only header text)
-    mask = records_df["product_characteristic"].astype(str).str.strip() != ""
+    # Drop rows whose product characteristic is blank or is a header remnant
+    # ('Product' / 'Process'), using one combined mask
+    product = records_df["product_characteristic"].astype(str)
+    mask = (product.str.strip() != "") & ~product.str.contains(r"^Product$|^Process$", case=False, na=False)
     records_df = records_df[mask]
 
-    # Remove rows where the product characteristic is literally 'Product' or 'Process' (header remnants)
-    records_df = records_df[
-        ~records_df["product_characteristic"].astype(str).str.contains(r"^Product$|^Process$", case=False)
-    ]
-
     # Fill NaN values in string columns with empty strings
-    for col in records_df.columns:
-        if records_df[col].dtype == object or pd.api.types.is_string_dtype(records_df[col]):
-            records_df[col] = records_df[col].fillna("")
+    string_cols = [
+        col for col in records_df.columns
+        if pd.api.types.is_string_dtype(records_df[col].dtype)
+    ]
+    records_df = records_df.fillna({col: "" for col in string_cols})
 
     data_records: List[Dict[str, Any]] = records_df.to_dict("records")
     return {"status": "success", "data": data_records}
\ No newline at end of file
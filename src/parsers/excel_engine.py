@@ -0,0 +1,48 @@
+"""
+Excel reader engine selection shared by the workbook parsers.
+
+``python-calamine`` is a Rust-backed reader that parses ``.xlsx`` files far
+faster than openpyxl's pure-Python XML walker.  It is used whenever it is
+installed; deployments without it fall back to ``openpyxl`` so the parsers
+and debug scripts keep working unchanged.
+"""
+
+from typing import Any, List, Optional
+
+try:
+    import python_calamine  # noqa: F401
+    EXCEL_ENGINE = "calamine"
+except ImportError:
+    EXCEL_ENGINE = "openpyxl"
+
+
+def _convert_cell(value: Any) -> Any:
+    if value == "":
+        return None
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def read_sheet_rows(path: str, sheet_name: str, nrows: Optional[int] = None) -> List[List[Any]]:
+    """Return the raw cell values of a worksheet as a list of rows.
+
+    Rows and columns are anchored at ``A1`` so list indices line up with
+    ``pd.read_excel(header=None)`` positions.  Empty cells are ``None`` and
+    integral floats come back as ``int``, as they do from ``read_excel``.
+    No DataFrame is built, which makes this the cheap option for scripts
+    that only want to look at a handful of header cells.
+    """
+    if EXCEL_ENGINE == "calamine":
+        sheet = python_calamine.CalamineWorkbook.from_path(path).get_sheet_by_name(sheet_name)
+        rows = sheet.to_python(skip_empty_area=False, nrows=nrows)
+        return [[_convert_cell(value) for value in row] for row in rows]
+
+    import openpyxl
+
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        sheet = workbook[sheet_name]
+        return [list(row) for row in sheet.iter_rows(max_row=nrows, values_only=True)]
+    finally:
+        workbook.close()
@@ -1,19 +1,23 @@
 """
 Enhanced parser for AIAG‑VDA Process FMEA workbooks.
 
-This module exposes a single ``parse`` function which reads the
-``00`` sheet from an FMEA Excel file and returns structured records.
+This module exposes a ``parse`` function which reads the
+``00`` sheet from an FMEA Excel file and returns structured records, and
+an ``iter_parse`` generator which yields the same records lazily.
 
-This version handles multi-level headers and extracts all columns from the
-FMEA file.
+This version reads the data rows below the two-row header and maps the
+FMEA columns onto the ``FmeaItem`` fields by position.
 """
 
 from __future__ import annotations
 
-import re
+import functools
+import numpy as np
 import pandas as pd
-from typing import Any, Dict, List, Union
-from src.utils.ap_logic import calculate_ap
+from typing import Any, Dict, Iterator, List, Tuple, Union
+from src.utils.ap_logic import calculate_ap_array
+from src.parsers.excel_engine import EXCEL_ENGINE
+from src.parsers.parse_cache import cache_df
 import logging
 
 logger = logging.getLogger(__name__)
@@ -25,199 +29,125 @@ def _flatten_columns(columns: pd.MultiIndex) -> List[str]:
     level starting with ``Unnamed`` or evaluating to NaN is ignored.
     Remaining parts are joined with a single space.  Multiple
     consecutive spaces and newlines are reduced to a single space.
+
+    The work is memoized on the column tuples, so parsing several
+    workbooks built from the same template flattens the header once.
     """
+    return list(_flatten_column_tuples(tuple(columns)))
+
+@functools.lru_cache(maxsize=32)
+def _flatten_column_tuples(columns: Tuple[Tuple[Any, ...], ...]) -> Tuple[str, ...]:
+    """Cached implementation of :func:`_flatten_columns` on hashable input."""
     flattened: List[str] = []
     for col in columns:
-        parts: List[str] = []
-        for level in col:
-            if level is None:
-                continue
-            level_str = str(level).strip()
-            if not level_str or level_str.startswith("Unnamed"):
-                continue
-            # Replace all whitespace (including newlines) with single spaces
-            level_str = re.sub(r"\s+", " ", level_str)
-            parts.append(level_str)
-        flattened.append(" ".join(parts))
-    return [part for part in flattened if part]
-
-def _calculate_ap(severity: int, occurrence: int, detection: int) -> str:
-    """Compute the AIAG‑VDA Action Priority (AP) from S/O/D bands.
-
-    The mapping implemented here is intentionally simplified.  See the
-    official FMEA manual for the full 1000‑cell table.  The logic
-    prioritises high severity combined with high occurrence and poor
-    detection as high priority; medium severity with moderate occurrence
-    and poor detection as high; otherwise falls back to medium or low.
-    """
-    # This function is not used in the new parser, but is kept for reference
-    pass
+        # ``" ".join(s.split())`` strips and collapses whitespace (including
+        # newlines) in one pass without going through the regex engine
+        levels = (" ".join(str(level).split()) for level in col if level is not None)
+        flattened.append(" ".join(part for part in levels if part and not part.startswith("Unnamed")))
+    return tuple(part for part in flattened if part)
+
+# Rating columns stored as TINYINT in ``fmcp_fmea_items``
+_RATING_COLUMNS = ("severity", "occurrence", "detection", "severity_opt", "occurrence_opt", "detection_opt")
+
+def _downcast_rating(series: pd.Series) -> pd.Series:
+    """Coerce a rating column to nullable ``Int8``, truncating like ``int(float(x))``."""
+    numeric = pd.to_numeric(series, errors="coerce")
+    # Values that cannot fit a TINYINT are treated as invalid
+    numeric = numeric.where(numeric.abs() < 128)
+    return np.trunc(numeric).astype("Int8")
 
-def parse(file_source: Union[str, Any]) -> Dict[str, Any]:
+def _has_text(series: pd.Series) -> np.ndarray:
+    """Boolean mask of cells that are neither missing nor blank text.
+
+    Equivalent to ``series.notna() & (series.astype(str).str.strip() != "")``
+    but done in one pass over the values, without building the stringified
+    and stripped copies of the column.
     """
-    Parse an FMEA Excel file and extract structured records.
+    return np.fromiter(
+        (
+            value.strip() != "" if isinstance(value, str)
+            else value is not None and value is not pd.NA and value == value
+            for value in series.to_numpy(dtype=object)
+        ),
+        dtype=bool,
+        count=len(series),
+    )
 
-    Parameters
-    ----------
-    file_source : Union[str, Any]
-        The path to a ``.xlsx`` file or a file‑like object containing
-        the workbook.
+# ``FmeaItem`` field held in each sheet column, by position (A–AG).  Based
+# on debug analysis: A(0) is empty, B(1) and C(2) hold the mostly empty
+# Issue #/History fields and the actual data starts from Column D (index 3).
+_POSITIONAL_FIELDS = (
+    None,  # Column A(0): empty, not mapped
+    "issue_no",  # Column B(1): Issue #
+    "history_change_authorization",  # Column C(2): History/Change Auth
+    "process_item",  # Column D(3): Process Item
+    "process_step",  # Column E(4): Process Step
+    "process_work_element",  # Column F(5): Process Work Element
+    "function_of_process_item",  # Column G(6): Function of Process Item
+    "function_of_process_step_and_product_characteristic",  # Column H(7): Function of Process Step & Product Characteristic
+    "function_of_process_work_element_and_process_characteristic",  # Column I(8): Function of Work Element & Process Characteristic
+    "failure_effects_description",  # Column J(9): Failure Effects (FE) to Next Higher Level
+    "severity",  # Column K(10): Severity (S) of FE
+    "failure_mode",  # Column L(11): Failure Mode (FM)
+    "failure_cause",  # Column M(12): Failure Cause (FC)
+    "prevention_controls_description",  # Column N(13): Current Prevention Controls (PC)
+    "occurrence",  # Column O(14): Occurrence (O) of FC
+    "detection_controls",  # Column P(15): Current Detection Controls (DC)
+    "detection",  # Column Q(16): Detection (D) of FC/FM
+    "ap",  # Column R(17): PFMEA AP
+    "special_characteristics",  # Column S(18): Special Characteristics
+    "filter_code",  # Column T(19): Filter Code
+    "prevention_action",  # Column U(20): Prevention Action
+    "detection_action",  # Column V(21): Detection Action
+    "responsible_person_name",  # Column W(22): Responsible Person's Name
+    "target_completion_date",  # Column X(23): Target Completion Date
+    "status",  # Column Y(24): Status
+    "action_taken",  # Column Z(25): Action Taken
+    "completion_date",  # Column AA(26): Completion Date
+    "severity_opt",  # Column AB(27): Severity (S) Opt
+    "occurrence_opt",  # Column AC(28): Occurrence (O) Opt
+    "detection_opt",  # Column AD(29): Detection (D) Opt
+    "ap_opt",  # Column AE(30): PFMEA AP Opt
+    "special_characteristics_opt",  # Column AF(31): Special Characteristics Opt
+    "remarks",  # Column AG(32): Remarks
+)
 
-    Returns
-    -------
-    dict
-        A dictionary with keys ``status`` and ``data``.  On success
-        ``status`` will be ``"success"`` and ``data`` contains a list
-        of dictionaries representing each row of the FMEA table.  On
-        failure ``status`` will be ``"error"`` and ``message`` will
-        describe the problem.
+# Columns A–AG are mapped onto ``FmeaItem`` fields by position in
+# ``_build_records``; anything to the right of them is never looked at.
+_FMEA_COLUMN_COUNT = len(_POSITIONAL_FIELDS)
+
+def _read_sheet(file_source: Union[str, Any], engine: str) -> pd.DataFrame:
+    """Read the data rows of the ``00`` sheet (row 11 onwards in Excel).
+
+    The two header rows (rows 9 and 10) are skipped rather than parsed into a
+    MultiIndex: fields are taken by column position, so the header names are
+    not needed, and pandas does not allow ``usecols`` together with a
+    multi‑row header.  Only the first ``_FMEA_COLUMN_COUNT`` columns are kept.
     """
     target_sheet = "00"
-    header_rows = [8, 9]  # Rows 9 and 10 in Excel (0-indexed)
-    try:
-        df = pd.read_excel(
-            file_source,
-            sheet_name=target_sheet,
-            header=header_rows,
-        )
-    except Exception as exc:
-        return {"status": "error", "message": f"Failed to read Excel: {exc}"}
+    first_data_row = 10  # Row 11 in Excel (0-indexed), below the header rows 9 and 10
+    # With the openpyxl fallback pandas already opens the workbook with
+    # read_only=True, data_only=True (streaming reader, no style objects),
+    # so there is nothing to gain from a hand-rolled load_workbook path
+    return pd.read_excel(
+        file_source,
+        sheet_name=target_sheet,
+        header=None,
+        skiprows=first_data_row,
+        # A callable rather than ``range(33)`` so narrower sheets do not fail
+        usecols=lambda position: position < _FMEA_COLUMN_COUNT,
+        engine=engine,
+    )
 
-    # Flatten the multi‑level column names
-    flattened_cols = _flatten_columns(df.columns)
-
-    # Ensure the number of flattened columns matches the DataFrame columns
-    if len(flattened_cols) != len(df.columns):
-        logger.warning(f"Column count mismatch: flattened_cols={len(flattened_cols)}, df.columns={len(df.columns)}")
-        # This handles cases where there are unnamed columns that are not filtered out
-        # by _flatten_columns, but are still present in the DataFrame.
-        if len(flattened_cols) < len(df.columns):
-            # Append placeholder names for missing column names
-            flattened_cols.extend([f"Unnamed_Column_{i}" for i in range(len(df.columns) - len(flattened_cols))])
-            logger.info(f"Added {len(df.columns) - len(flattened_cols)} unnamed columns")
-        else:
-            # Trim flattened_cols to match df.columns length
-            flattened_cols = flattened_cols[:len(df.columns)]
-            logger.info(f"Trimmed flattened_cols to match df.columns length")
-
-    df.columns = flattened_cols
+def _build_records(df: pd.DataFrame) -> pd.DataFrame:
+    """Map the raw sheet onto the ``FmeaItem`` columns and compute AP values."""
+    # Map the sheet columns onto the FmeaItem fields by position in one
+    # slice; narrower sheets simply lack the trailing fields, which are added
+    # as empty columns below.  Column A is not mapped.
+    mapped_count = min(len(df.columns), len(_POSITIONAL_FIELDS))
+    records_df = df.iloc[:, 1:mapped_count]
+    records_df.columns = list(_POSITIONAL_FIELDS[1:mapped_count])
 
-    # Filter out columns that are not in the FmeaItem model
-    # This list should match the columns defined in models.py for FmeaItem
-    # CORRECTED MAPPING: Use cleaned column names that preserve Excel structure 
-    # This approach maintains the original Excel column names while making them database-friendly
-    def clean_column_name(col_name):
-        """Clean column name to be database-friendly while preserving meaning"""
-        return col_name.replace('/', '_').replace('(', '_').replace(')', '_').replace(' ', '_').replace('__', '_').strip('_')
-    
-    # Don't rename columns - keep original Excel column names
-    # The database and frontend will use the cleaned versions
-    column_mapping = {}
-    
-    # Instead, we'll create the cleaned names dynamically
-    cleaned_columns = []
-    for col in flattened_cols:
-        if col.strip():  # Skip empty column names
-            cleaned_name = clean_column_name(col)
-            cleaned_columns.append(cleaned_name)
-            column_mapping[col] = cleaned_name
-        else:
-            cleaned_columns.append(f"Unknown_Column_{len(cleaned_columns)}")
-    
-    # However, we need to fix the critical data mapping issues you identified:
-    # The Excel has wrong data in some columns due to structure issues
-    
-    # Create a special mapping to fix the data placement issues
-    data_fix_mapping = {}
-
-    # Apply column name cleaning
-    df.columns = [clean_column_name(col) if col.strip() else f"Unknown_Column_{i}" for i, col in enumerate(flattened_cols)]
-    
-    # Now we need to fix the data placement issues you identified
-    # Based on the analysis, we need to create new columns with correct data
-    
-    # Extract the correct field mappings based on actual Excel column positions
-    # Based on debug analysis: data starts from Column D (index 3) onwards
-    # A(0)=empty, B(1)=Issue#(empty), C(2)=History(empty), D(3)=first data column
-    
-    correct_field_data = {}
-    
-    # Columns A, B, C are mostly empty or contain Issue#/History fields
-    if len(df.columns) > 1:
-        correct_field_data['issue_no'] = df.iloc[:, 1] if 1 < len(df.columns) else None  # Column B(1): Issue #
-    if len(df.columns) > 2:
-        correct_field_data['history_change_authorization'] = df.iloc[:, 2] if 2 < len(df.columns) else None  # Column C(2): History/Change Auth
-    
-    # Actual data columns start from Column D (index 3)
-    if len(df.columns) > 3:
-        correct_field_data['process_item'] = df.iloc[:, 3] if 3 < len(df.columns) else None  # Column D(3): Process Item
-    if len(df.columns) > 4:
-        correct_field_data['process_step'] = df.iloc[:, 4] if 4 < len(df.columns) else None  # Column E(4): Process Step  
-    if len(df.columns) > 5:
-        correct_field_data['process_work_element'] = df.iloc[:, 5] if 5 < len(df.columns) else None  # Column F(5): Process Work Element
-    if len(df.columns) > 6:
-        correct_field_data['function_of_process_item'] = df.iloc[:, 6] if 6 < len(df.columns) else None  # Column G(6): Function of Process Item
-    if len(df.columns) > 7:
-        correct_field_data['function_of_process_step_and_product_characteristic'] = df.iloc[:, 7] if 7 < len(df.columns) else None  # Column H(7): Function of Process Step & Product Characteristic
-    if len(df.columns) > 8:
-        correct_field_data['function_of_process_work_element_and_process_characteristic'] = df.iloc[:, 8] if 8 < len(df.columns) else None  # Column I(8): Function of Work Element & Process Characteristic
-    if len(df.columns) > 9:
-        correct_field_data['failure_effects_description'] = df.iloc[:, 9] if 9 < len(df.columns) else None  # Column J(9): Failure Effects (FE) to Next Higher Level
-    if len(df.columns) > 10:
-        correct_field_data['severity'] = df.iloc[:, 10] if 10 < len(df.columns) else None  # Column K(10): Severity (S) of FE
-    if len(df.columns) > 11:
-        correct_field_data['failure_mode'] = df.iloc[:, 11] if 11 < len(df.columns) else None  # Column L(11): Failure Mode (FM)
-    if len(df.columns) > 12:
-        correct_field_data['failure_cause'] = df.iloc[:, 12] if 12 < len(df.columns) else None  # Column M(12): Failure Cause (FC)
-    if len(df.columns) > 13:
-        correct_field_data['prevention_controls_description'] = df.iloc[:, 13] if 13 < len(df.columns) else None  # Column N(13): Current Prevention Controls (PC)
-    if len(df.columns) > 14:
-        correct_field_data['occurrence'] = df.iloc[:, 14] if 14 < len(df.columns) else None  # Column O(14): Occurrence (O) of FC
-    if len(df.columns) > 15:
-        correct_field_data['detection_controls'] = df.iloc[:, 15] if 15 < len(df.columns) else None  # Column P(15): Current Detection Controls (DC)
-    if len(df.columns) > 16:
-        correct_field_data['detection'] = df.iloc[:, 16] if 16 < len(df.columns) else None  # Column Q(16): Detection (D) of FC/FM
-    if len(df.columns) > 17:
-        correct_field_data['ap'] = df.iloc[:, 17] if 17 < len(df.columns) else None  # Column R(17): PFMEA AP
-    if len(df.columns) > 18:
-        correct_field_data['special_characteristics'] = df.iloc[:, 18] if 18 < len(df.columns) else None  # Column S(18): Special Characteristics
-    if len(df.columns) > 19:
-        correct_field_data['filter_code'] = df.iloc[:, 19] if 19 < len(df.columns) else None  # Column T(19): Filter Code
-    
-    # Add the remaining optimization fields (STEP 6)
-    if len(df.columns) > 20:
-        correct_field_data['prevention_action'] = df.iloc[:, 20] if 20 < len(df.columns) else None  # Column U(20): Prevention Action
-    if len(df.columns) > 21:
-        correct_field_data['detection_action'] = df.iloc[:, 21] if 21 < len(df.columns) else None  # Column V(21): Detection Action
-    if len(df.columns) > 22:
-        correct_field_data['responsible_person_name'] = df.iloc[:, 22] if 22 < len(df.columns) else None  # Column W(22): Responsible Person's Name
-    if len(df.columns) > 23:
-        correct_field_data['target_completion_date'] = df.iloc[:, 23] if 23 < len(df.columns) else None  # Column X(23): Target Completion Date
-    if len(df.columns) > 24:
-        correct_field_data['status'] = df.iloc[:, 24] if 24 < len(df.columns) else None  # Column Y(24): Status
-    if len(df.columns) > 25:
-        correct_field_data['action_taken'] = df.iloc[:, 25] if 25 < len(df.columns) else None  # Column Z(25): Action Taken
-    if len(df.columns) > 26:
-        correct_field_data['completion_date'] = df.iloc[:, 26] if 26 < len(df.columns) else None  # Column AA(26): Completion Date
-    if len(df.columns) > 27:
-        correct_field_data['severity_opt'] = df.iloc[:, 27] if 27 < len(df.columns) else None  # Column AB(27): Severity (S) Opt
-    if len(df.columns) > 28:
-        correct_field_data['occurrence_opt'] = df.iloc[:, 28] if 28 < len(df.columns) else None  # Column AC(28): Occurrence (O) Opt
-    if len(df.columns) > 29:
-        correct_field_data['detection_opt'] = df.iloc[:, 29] if 29 < len(df.columns) else None  # Column AD(29): Detection (D) Opt
-    if len(df.columns) > 30:
-        correct_field_data['ap_opt'] = df.iloc[:, 30] if 30 < len(df.columns) else None  # Column AE(30): PFMEA AP Opt
-    if len(df.columns) > 31:
-        correct_field_data['special_characteristics_opt'] = df.iloc[:, 31] if 31 < len(df.columns) else None  # Column AF(31): Special Characteristics Opt
-    if len(df.columns) > 32:
-        correct_field_data['remarks'] = df.iloc[:, 32] if 32 < len(df.columns) else None  # Column AG(32): Remarks
-    
-    # Note: Removed unused fields: process_function, function_of_process_work_element, 
-    # failure_effects, prevention_controls - these are no longer needed
-    
-    # Create a new DataFrame with the correctly mapped data
-    records_df = pd.DataFrame(correct_field_data)
-    
     # Debug: Log what we have
     logger.info(f"Created DataFrame with {len(records_df.columns)} columns: {list(records_df.columns)}")
 
@@ -270,67 +200,117 @@ def parse(file_source: Union[str, Any]) -> Dict[str, Any]:
     # Reorder columns to match the expected order
     records_df = records_df.reindex(columns=valid_fmea_item_columns, fill_value=None)
 
-    # Forward‑fill hierarchical fields to handle merged cells
-    for col in records_df.columns:
-        try:
-            if records_df[col].dtype == object or pd.api.types.is_string_dtype(records_df[col]):
-                records_df[col] = records_df[col].ffill()
-        except Exception as e:
-            logger.warning(f"Error forward-filling column {col}: {e}")
+    # Forward‑fill hierarchical fields to handle merged cells.  Only the text
+    # (object/string) columns are filled, all in one DataFrame-level call.
+    string_cols = [
+        col for col in records_df.columns
+        if pd.api.types.is_string_dtype(records_df[col].dtype)
+    ]
+    records_df[string_cols] = records_df[string_cols].ffill()
 
     # Since failure_mode is missing from this Excel format, we'll use failure_cause as the basis for filtering
     # Filter out rows without meaningful data (using failure_cause as the primary filter)
     if 'failure_cause' in records_df.columns:
-        mask = records_df['failure_cause'].astype(str).str.strip() != ""
-        mask = mask & (records_df['failure_cause'].notna())
-        records_df = records_df[mask]
-    
+        records_df = records_df[_has_text(records_df['failure_cause'])]
+
+    # Nothing left to fill, rate or convert (e.g. an empty or template-only sheet)
+    if records_df.empty:
+        return records_df
+
     # For this Excel format, we'll set failure_mode to be the same as failure_cause
     # since they appear to be combined in this particular FMEA format
     if 'failure_cause' in records_df.columns and 'failure_mode' not in records_df.columns:
         records_df['failure_mode'] = records_df['failure_cause']
 
     # Fill NaN values in string columns with empty strings
+    records_df = records_df.fillna({col: "" for col in string_cols})
+
+    # S/O/D ratings are single-digit TINYINT values; store them as nullable
+    # Int8 instead of float64/object.  Non-numeric cells become NULL.
+    for col in _RATING_COLUMNS:
+        if col in records_df.columns:
+            records_df[col] = _downcast_rating(records_df[col])
+
+    # Calculate AP from the S, O, D values for all rows at once; rows with a
+    # missing or out-of-range rating get None
+    records_df['ap'] = calculate_ap_array(
+        *(records_df[col].to_numpy(dtype="float64", na_value=np.nan) for col in ("severity", "occurrence", "detection"))
+    )
+    records_df['ap_opt'] = calculate_ap_array(
+        *(records_df[col].to_numpy(dtype="float64", na_value=np.nan) for col in ("severity_opt", "occurrence_opt", "detection_opt"))
+    )
+
+    # Replace NaN with None for database compatibility, especially for non-string columns.
+    # Columns with missing values are forced to object type to prevent pandas from
+    # converting None back to NaN, and numeric columns so rows carry Python ints rather
+    # than numpy scalars.  Text columns without gaps are left alone instead of copying
+    # the whole frame.
     for col in records_df.columns:
-        try:
-            if records_df[col].dtype == object or pd.api.types.is_string_dtype(records_df[col]):
-                records_df[col] = records_df[col].fillna("")
-        except Exception as e:
-            logger.warning(f"Error filling NaN values in column {col}: {e}")
-
-    # Calculate AP based on S, O, D values before returning data
-    for index, row in records_df.iterrows():
-        try:
-            # Convert to int if possible, handling various input formats
-            s = int(float(str(row['severity']).strip())) if pd.notna(row['severity']) and str(row['severity']).strip() != '' else None
-            o = int(float(str(row['occurrence']).strip())) if pd.notna(row['occurrence']) and str(row['occurrence']).strip() != '' else None
-            d = int(float(str(row['detection']).strip())) if pd.notna(row['detection']) and str(row['detection']).strip() != '' else None
-            
-            if s is not None and o is not None and d is not None:
-                records_df.loc[index, 'ap'] = calculate_ap(s, o, d)
-            else:
-                records_df.loc[index, 'ap'] = None
-        except (ValueError, TypeError) as e:
-            logger.warning(f"Failed to calculate AP for row {index}: severity={row['severity']}, occurrence={row['occurrence']}, detection={row['detection']}, error={e}")
-            records_df.loc[index, 'ap'] = None
-
-        try:
-            s_opt = int(float(str(row['severity_opt']).strip())) if pd.notna(row['severity_opt']) and str(row['severity_opt']).strip() != '' else None
-            o_opt = int(float(str(row['occurrence_opt']).strip())) if pd.notna(row['occurrence_opt']) and str(row['occurrence_opt']).strip() != '' else None
-            d_opt = int(float(str(row['detection_opt']).strip())) if pd.notna(row['detection_opt']) and str(row['detection_opt']).strip() != '' else None
-            
-            if s_opt is not None and o_opt is not None and d_opt is not None:
-                records_df.loc[index, 'ap_opt'] = calculate_ap(s_opt, o_opt, d_opt)
-            else:
-                records_df.loc[index, 'ap_opt'] = None
-        except (ValueError, TypeError) as e:
-            logger.warning(f"Failed to calculate AP_opt for row {index}: severity_opt={row.get('severity_opt')}, occurrence_opt={row.get('occurrence_opt')}, detection_opt={row.get('detection_opt')}, error={e}")
-            records_df.loc[index, 'ap_opt'] = None
-
-    # Replace NaN with None for database compatibility, especially for non-string columns
-    # Convert all NaN to None, forcing object type to prevent pandas from converting None back to NaN
-    records_df = records_df.astype(object).where(pd.notna(records_df), None)
+        missing = records_df[col].isna()
+        if missing.any() or not pd.api.types.is_string_dtype(records_df[col].dtype):
+            records_df[col] = records_df[col].astype(object).mask(missing, None)
 
     logger.info(f"Columns in records_df before to_dict: {records_df.columns.tolist()}")
-    data_records: List[Dict[str, Any]] = records_df.to_dict("records")
-    return {"status": "success", "data": data_records}
\ No newline at end of file
+    return records_df
+
+def _iter_records(records_df: pd.DataFrame) -> Iterator[Dict[str, Any]]:
+    """Yield one dictionary per row without building the full list.
+
+    Rows are zipped together from per-column ``tolist()`` values, which
+    already hold plain Python objects; this is several times faster than
+    ``itertuples`` or ``to_dict("records")`` for the all-object frames
+    built by ``_build_records``.
+    """
+    columns = records_df.columns.tolist()
+    for row in zip(*(records_df[col].tolist() for col in columns)):
+        yield dict(zip(columns, row))
+
+def iter_parse(file_source: Union[str, Any], engine: str = EXCEL_ENGINE) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily parse an FMEA Excel file, yielding one record per FMEA row.
+
+    Unlike :func:`parse` this does not materialise the full list of
+    records, which keeps memory flat for callers that only need to
+    stream or inspect part of a large workbook.  Errors reading the
+    workbook are raised rather than reported in a status dictionary.
+    """
+    records_df = _build_records(_read_sheet(file_source, engine))
+    yield from _iter_records(records_df)
+
+def parse_list(file_source: Union[str, Any], engine: str = EXCEL_ENGINE) -> List[Dict[str, Any]]:
+    """Materialise :func:`iter_parse` for callers that need random access."""
+    return list(iter_parse(file_source, engine))
+
+@cache_df()
+def parse(file_source: Union[str, Any], engine: str = EXCEL_ENGINE) -> Dict[str, Any]:
+    """
+    Parse an FMEA Excel file and extract structured records.
+
+    Parameters
+    ----------
+    file_source : Union[str, Any]
+        The path to a ``.xlsx`` file, a file‑like object containing
+        the workbook, or an already open ``pd.ExcelFile``.  Passing an
+        ``ExcelFile`` lets callers that read several sheets (such as the
+        upload endpoint) unpack the workbook only once.
+    engine : str
+        The ``pandas.read_excel`` engine.  Defaults to ``calamine`` when
+        ``python-calamine`` is installed and ``openpyxl`` otherwise.  It
+        must match the engine of an ``ExcelFile`` passed as the source.
+
+    Returns
+    -------
+    dict
+        A dictionary with keys ``status`` and ``data``.  On success
+        ``status`` will be ``"success"`` and ``data`` contains a list
+        of dictionaries representing each row of the FMEA table.  On
+        failure ``status`` will be ``"error"`` and ``message`` will
+        describe the problem.
+    """
+    try:
+        df = _read_sheet(file_source, engine)
+    except Exception as exc:
+        return {"status": "error", "message": f"Failed to read Excel: {exc}"}
+
+    data_records: List[Dict[str, Any]] = list(_iter_records(_build_records(df)))
+    return {"status": "success", "data": data_records}
@@ -0,0 +1,182 @@
+"""
+On-disk cache for parsed workbook results.
+
+Parsing the FMEA and Control Plan workbooks is dominated by reading the
+Excel file itself.  When the same workbook is parsed repeatedly (for
+example while iterating on ``main.py`` or the debug scripts) the
+``cache_df`` decorator below stores the parser's result in a pickle keyed
+by the SHA‑1 of the workbook bytes, so later calls skip the Excel read
+entirely.
+
+The key also includes a hash of the parser module's source together with
+everything parsers share (the ``src.parsers`` package and
+``src.utils.ap_logic``), so editing the mapping or AP logic invalidates
+previously cached results, and of the parser's remaining arguments (such
+as ``engine``), so results read with different options never mix.  Path inputs are
+cached on disk.  Streams and open workbooks are only cached when the caller
+passes their ``content_digest`` (the upload endpoint does, so re-uploading
+an identical workbook skips parsing); those results are kept in a small
+in‑memory LRU instead.  Caching can be switched off globally with
+:func:`set_enabled`.
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import inspect
+import logging
+import os
+import pickle
+import sys
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_enabled = True
+
+# Pickled results for digest-keyed (in-memory) sources, most recent last
+_MAX_MEMORY_ENTRIES = 16
+_results_lock = threading.Lock()
+_results_by_digest: "OrderedDict[Tuple[str, str, str, str], bytes]" = OrderedDict()
+
+# Source files every parser's output depends on besides its own module
+_PARSERS_DIR = Path(__file__).resolve().parent
+_SHARED_SOURCES = (
+    *sorted(_PARSERS_DIR.glob("*.py")),
+    _PARSERS_DIR.parent / "utils" / "ap_logic.py",
+)
+
+
+def set_enabled(enabled: bool) -> None:
+    """Globally enable or disable the parse cache (e.g. for ``--no-cache``)."""
+    global _enabled
+    _enabled = enabled
+
+
+def _sha1_of_file(path: Path) -> str:
+    digest = hashlib.sha1()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _source_hash(files: Iterable[Path]) -> str:
+    """Return a short SHA‑1 over the contents of ``files``, in order."""
+    digest = hashlib.sha1()
+    for path in files:
+        try:
+            digest.update(path.read_bytes())
+        except OSError:
+            digest.update(b"missing:" + str(path).encode("utf-8"))
+    return digest.hexdigest()[:8]
+
+
+def _as_path(file_source: Any) -> Optional[Path]:
+    """Return ``file_source`` as a path, or ``None`` for streams and handles."""
+    if not isinstance(file_source, (str, os.PathLike)):
+        return None
+    try:
+        return Path(file_source)
+    except TypeError:
+        # e.g. a pd.ExcelFile opened on a stream: it is PathLike, but its
+        # __fspath__ hands back the stream rather than a filesystem path
+        return None
+
+
+def _cached_in_memory(key: Tuple[str, str, str, str], func: Callable[..., Dict[str, Any]], *args: Any, **kwargs: Any) -> Dict[str, Any]:
+    """Look ``key`` up in the in-memory LRU, calling ``func`` on a miss.
+
+    Results are stored pickled so every hit hands back fresh objects, just
+    like a load from the on-disk cache; callers may mutate what they get.
+    """
+    with _results_lock:
+        pickled = _results_by_digest.get(key)
+        if pickled is not None:
+            _results_by_digest.move_to_end(key)
+    if pickled is not None:
+        return pickle.loads(pickled)
+
+    # Parse outside the lock so concurrent uploads of different workbooks
+    # do not wait on each other
+    result = func(*args, **kwargs)
+    if result.get("status") == "success":
+        pickled = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+        with _results_lock:
+            _results_by_digest[key] = pickled
+            _results_by_digest.move_to_end(key)
+            if len(_results_by_digest) > _MAX_MEMORY_ENTRIES:
+                _results_by_digest.popitem(last=False)
+    return result
+
+
+def cache_df(cache_dir: str = ".cache/xlsx") -> Callable:
+    """Memoize a ``parse(file_source)`` function on the workbook content hash.
+
+    Successful results for path inputs are pickled to ``cache_dir`` as
+    ``<parser>_<basename>_<source>_<options>_<sha1>.pkl``.  For any other
+    source the wrapped function accepts a keyword-only ``content_digest`` (e.g. from
+    :func:`src.parsers._workbook_cache.fileobj_digest`); when given, results
+    are cached in memory under that digest.  Error results are never cached.
+    """
+
+    def decorator(func: Callable[..., Dict[str, Any]]) -> Callable[..., Dict[str, Any]]:
+        module = sys.modules.get(func.__module__)
+        module_file = getattr(module, "__file__", None)
+        own_source = (Path(module_file).resolve(),) if module_file else ()
+        source_hash = _source_hash(own_source + _SHARED_SOURCES)
+        parser_name = func.__module__.rsplit(".", 1)[-1]
+        signature = inspect.signature(func)
+
+        def options_hash(file_source: Any, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> str:
+            # Bind with defaults applied so parse(path) and
+            # parse(path, engine=<default>) share one entry
+            bound = signature.bind(file_source, *args, **kwargs)
+            bound.apply_defaults()
+            options = list(bound.arguments.items())[1:]
+            return hashlib.sha1(repr(options).encode("utf-8")).hexdigest()[:8]
+
+        @functools.wraps(func)
+        def wrapper(file_source: Any, *args: Any, content_digest: Optional[str] = None, **kwargs: Any) -> Dict[str, Any]:
+            if content_digest is not None and _enabled:
+                key = (parser_name, source_hash, options_hash(file_source, args, kwargs), content_digest)
+                return _cached_in_memory(key, func, file_source, *args, **kwargs)
+
+            path = _as_path(file_source) if _enabled else None
+            if path is None:
+                return func(file_source, *args, **kwargs)
+
+            try:
+                content_hash = _sha1_of_file(path)
+            except OSError:
+                # Let the parser report the unreadable file in its usual format
+                return func(file_source, *args, **kwargs)
+
+            options = options_hash(file_source, args, kwargs)
+            cache_file = Path(cache_dir) / f"{parser_name}_{path.stem}_{source_hash}_{options}_{content_hash}.pkl"
+            if cache_file.exists():
+                try:
+                    with open(cache_file, "rb") as fh:
+                        return pickle.load(fh)
+                except Exception as exc:
+                    logger.warning(f"Ignoring unreadable parse cache {cache_file}: {exc}")
+
+            result = func(file_source, *args, **kwargs)
+            if result.get("status") == "success":
+                try:
+                    cache_file.parent.mkdir(parents=True, exist_ok=True)
+                    tmp_file = cache_file.with_suffix(".tmp")
+                    with open(tmp_file, "wb") as fh:
+                        pickle.dump(result, fh, protocol=pickle.HIGHEST_PROTOCOL)
+                    os.replace(tmp_file, cache_file)
+                except OSError as exc:
+                    logger.warning(f"Could not write parse cache {cache_file}: {exc}")
+            return result
+
+        return wrapper
+
+    return decorator
@@ -1,9 +1,15 @@
+import base64
+import functools
+import hashlib
+import hmac
+import json
 import logging
-from datetime import datetime, timedelta
+import threading
+import time
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+import bcrypt
+from sqlalchemy import bindparam, select
 from sqlalchemy.orm import Session
 
 from src.database import models, database
@@ -13,29 +19,195 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # --- Password Hashing ---
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# bcrypt is called directly rather than through passlib, which is no longer
+# maintained and fails against bcrypt >= 4.1.  The hashes are the same
+# "$2b$<cost>$..." strings passlib produced, so stored passwords still verify.
+BCRYPT_ROUNDS = settings.BCRYPT_ROUNDS
+# bcrypt only uses the first 72 bytes of a password.  passlib truncated longer
+# passwords silently while bcrypt >= 5 raises, so truncate to keep logins working.
+BCRYPT_MAX_PASSWORD_BYTES = 72
 
 # --- JWT Configuration ---
 SECRET_KEY = settings.SECRET_KEY
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
+# Tokens are only ever HS256 under SECRET_KEY, so they are signed and checked
+# here directly instead of through a general-purpose JWT library.  The header
+# segment never changes, and the HMAC state keyed with SECRET_KEY is built
+# once and copied per token rather than re-deriving the padded key each time.
+_JWT_HEADER_SEGMENT = base64.urlsafe_b64encode(
+    json.dumps({"alg": ALGORITHM, "typ": "JWT"}, separators=(",", ":"), sort_keys=True).encode("ascii")
+).rstrip(b"=")
+_JWT_MAC = hmac.new(SECRET_KEY.encode("utf-8"), digestmod=hashlib.sha256)
+
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/token")
 
+# Built once so every authenticated request reuses the same statement (and
+# its entry in the engine's compiled cache) instead of building an ORM query
+_USER_BY_USERNAME = select(models.User).where(models.User.username == bindparam("username"))
+
+# --- Login Throttling ---
+MAX_FAILED_LOGINS = 5
+FAILED_LOGIN_WINDOW_SECONDS = 60
+
+_failed_logins_lock = threading.Lock()
+_failed_logins = {}  # (username, client_ip) -> list of failure timestamps
+
+# --- Validated Token Cache ---
+# Clients send the same bearer token on every request until it expires, so
+# once a token has passed signature and expiry checks its subject is kept
+# until the token's own "exp" and later requests skip the check.  Tokens
+# that fail verification are never stored.
+_TOKEN_CACHE_MAX_ENTRIES = 10_000
+_token_cache_lock = threading.Lock()
+_token_cache = {}  # token -> (exp as epoch seconds, username)
+
 # --- Functions ---
 
+def _password_bytes(password):
+    return password.encode("utf-8")[:BCRYPT_MAX_PASSWORD_BYTES]
+
+# Modular-crypt prefixes of the bcrypt variants bcrypt.checkpw accepts; a
+# bcrypt hash is always 60 characters long
+_BCRYPT_PREFIXES = ("$2a$", "$2b$", "$2y$")
+_BCRYPT_HASH_LENGTH = 60
+
 def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+    # Anything that is not a bcrypt hash (e.g. a placeholder written by hand)
+    # can never match; turn it down before touching bcrypt
+    if (
+        not hashed_password
+        or len(hashed_password) != _BCRYPT_HASH_LENGTH
+        or not hashed_password.startswith(_BCRYPT_PREFIXES)
+    ):
+        return False
+    try:
+        return bcrypt.checkpw(_password_bytes(plain_password), hashed_password.encode("utf-8"))
+    except ValueError:
+        # Right shape but not a valid hash (bad cost or salt)
+        return False
 
 def get_password_hash(password):
-    return pwd_context.hash(password)
+    return bcrypt.hashpw(_password_bytes(password), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode("ascii")
+
+def password_needs_rehash(hashed_password):
+    """
+    True if ``hashed_password`` was made with a cost other than
+    BCRYPT_ROUNDS.  The cost is read from the "$2b$<cost>$" prefix, so this
+    costs no hashing; callers re-hash once the password has been verified.
+    """
+    parts = hashed_password.split("$")
+    return len(parts) < 4 or not parts[2].isdigit() or int(parts[2]) != BCRYPT_ROUNDS
+
+@functools.lru_cache(maxsize=1)
+def _dummy_hash():
+    return get_password_hash("timing-equalisation-placeholder")
+
+def verify_password_for_unknown_user(plain_password):
+    """
+    Burns the same bcrypt time as a real check so a login for an unknown
+    username cannot be told apart from a wrong password by response time.
+    Always returns False.
+    """
+    verify_password(plain_password, _dummy_hash())
+    return False
+
+def login_throttled(key):
+    """True if ``key`` has MAX_FAILED_LOGINS failures within the window."""
+    cutoff = time.monotonic() - FAILED_LOGIN_WINDOW_SECONDS
+    with _failed_logins_lock:
+        recent = [t for t in _failed_logins.get(key, []) if t > cutoff]
+        if recent:
+            _failed_logins[key] = recent
+        else:
+            _failed_logins.pop(key, None)
+        return len(recent) >= MAX_FAILED_LOGINS
+
+def record_failed_login(key):
+    with _failed_logins_lock:
+        _failed_logins.setdefault(key, []).append(time.monotonic())
+
+def reset_failed_logins(key):
+    with _failed_logins_lock:
+        _failed_logins.pop(key, None)
+
+def _b64url_encode(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+def _b64url_decode(segment: bytes) -> bytes:
+    return base64.urlsafe_b64decode(segment + b"=" * (-len(segment) % 4))
+
+def _jwt_signature(signing_input: bytes) -> bytes:
+    mac = _JWT_MAC.copy()
+    mac.update(signing_input)
+    return _b64url_encode(mac.digest())
 
 def create_access_token(data: dict):
     to_encode = data.copy()
-    expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-    return encoded_jwt
+    to_encode.update({"exp": int(time.time()) + ACCESS_TOKEN_EXPIRE_MINUTES * 60})
+    payload_segment = _b64url_encode(json.dumps(to_encode, separators=(",", ":")).encode("utf-8"))
+    signing_input = _JWT_HEADER_SEGMENT + b"." + payload_segment
+    return (signing_input + b"." + _jwt_signature(signing_input)).decode("ascii")
+
+def _decode_jwt(token: str) -> dict:
+    """
+    Verifies a token made by create_access_token and returns its claims.
+    Raises ValueError if it is malformed, not signed with SECRET_KEY or
+    expired.
+    """
+    signing_input, _, signature = token.encode("ascii").rpartition(b".")
+    header_segment, _, payload_segment = signing_input.partition(b".")
+    # Only our own fixed HS256 header is accepted, which also rules out
+    # "alg": "none" and algorithm-confusion tokens
+    if header_segment != _JWT_HEADER_SEGMENT or not payload_segment:
+        raise ValueError("Invalid header or token structure")
+    if not hmac.compare_digest(signature, _jwt_signature(signing_input)):
+        raise ValueError("Signature verification failed.")
+    payload = json.loads(_b64url_decode(payload_segment))
+    if not isinstance(payload, dict):
+        raise ValueError("Invalid payload")
+    expires_at = payload.get("exp")
+    if expires_at is not None:
+        if not isinstance(expires_at, (int, float)):
+            raise ValueError("Expiration Time claim (exp) must be a number.")
+        if expires_at < time.time():
+            raise ValueError("Signature has expired.")
+    if not isinstance(payload.get("sub", ""), str):
+        raise ValueError("Subject must be a string.")
+    return payload
+
+def decode_access_token(token: str):
+    """
+    Returns the username ("sub") of a valid, unexpired token, or None.
+    Results for valid tokens are cached until the token expires.
+    """
+    now = time.time()
+    with _token_cache_lock:
+        entry = _token_cache.get(token)
+        if entry is not None:
+            if entry[0] > now:
+                return entry[1]
+            del _token_cache[token]
+
+    try:
+        payload = _decode_jwt(token)
+    except ValueError as e:
+        logger.error(f"JWT Error: {e}")
+        return None
+    username = payload.get("sub")
+    expires_at = payload.get("exp")
+    if username is None or not isinstance(expires_at, (int, float)):
+        return username
+
+    with _token_cache_lock:
+        if len(_token_cache) >= _TOKEN_CACHE_MAX_ENTRIES:
+            for stale in [t for t, (exp, _) in _token_cache.items() if exp <= now]:
+                del _token_cache[stale]
+            while len(_token_cache) >= _TOKEN_CACHE_MAX_ENTRIES:
+                del _token_cache[next(iter(_token_cache))]
+        _token_cache[token] = (expires_at, username)
+    return username
 
 def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(database.get_db)):
     credentials_exception = HTTPException(
@@ -43,21 +215,19 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        username: str = payload.get("sub")
-        if username is None:
-            raise credentials_exception
-    except JWTError as e:
-        logger.error(f"JWT Error: {e}")
+    username = decode_access_token(token)
+    if username is None:
         raise credentials_exception
 
-    user = db.query(models.User).filter(models.User.username == username).first()
+    user = db.execute(_USER_BY_USERNAME, {"username": username}).scalar_one_or_none()
     if user is None:
         raise credentials_exception
     return user
 
+@functools.lru_cache(maxsize=None)
 def require_role(role: str):
+    # One checker per role, so every route guarded by the same role shares
+    # the same dependency callable and FastAPI resolves it once per request
     def role_checker(current_user: models.User = Depends(get_current_user)) -> models.User:
         if current_user.role != role and current_user.role != 'admin':
             raise HTTPException(
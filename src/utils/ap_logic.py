@@ -20,7 +20,9 @@
 # combinations not explicitly covered fall back to Low.  If your organisation
 # has a customised AP matrix, this module can be extended accordingly.
 
-from typing import Dict
+from typing import Dict, Tuple
+
+import numpy as np
 
 # Severity rating descriptions (1=least severe, 10=most severe) based on AIAG‑VDA FMEA
 # manual examples【160702036562110†L483-L520】.
@@ -67,6 +69,14 @@ DETECTION_LEVELS: Dict[int, str] = {
     1: "Fault always detected automatically and responded in any operating condition【160702036562110†L601-L603】",
 }
 
+# Band label for each rating, indexed by the rating itself (index 0 is unused),
+# so classifying a rating is a single tuple index instead of a chain of range
+# comparisons.
+_SEVERITY_BANDS = (None, '1', '2-3', '2-3', '4-6', '4-6', '4-6', '7-8', '7-8', '9-10', '9-10')
+_OCCURRENCE_BANDS = (None, '1', '2-3', '2-3', '4-5', '4-5', '6-7', '6-7', '8-10', '8-10', '8-10')
+_DETECTION_BANDS = (None, '1', '2-4', '2-4', '2-4', '5-6', '5-6', '7-10', '7-10', '7-10', '7-10')
+
+
 def _classify_severity(value: int) -> str:
     """
     Classify a numeric severity rating into the severity band used by the AIAG–VDA
@@ -79,15 +89,7 @@ def _classify_severity(value: int) -> str:
     Returns:
         str: A label representing the severity band (e.g. '9-10', '7-8').
     """
-    if value == 1:
-        return '1'
-    if 2 <= value <= 3:
-        return '2-3'
-    if 4 <= value <= 6:
-        return '4-6'
-    if 7 <= value <= 8:
-        return '7-8'
-    return '9-10'
+    return _SEVERITY_BANDS[min(max(value, 1), 10)]
 
 
 def _classify_occurrence(value: int) -> str:
@@ -102,15 +104,7 @@ def _classify_occurrence(value: int) -> str:
     Returns:
         str: Band label representing the occurrence range.
     """
-    if value == 1:
-        return '1'
-    if 2 <= value <= 3:
-        return '2-3'
-    if 4 <= value <= 5:
-        return '4-5'
-    if 6 <= value <= 7:
-        return '6-7'
-    return '8-10'
+    return _OCCURRENCE_BANDS[min(max(value, 1), 10)]
 
 
 def _classify_detection(value: int) -> str:
@@ -124,13 +118,7 @@ def _classify_detection(value: int) -> str:
     Returns:
         str: Band label for the detection range.
     """
-    if value == 1:
-        return '1'
-    if 2 <= value <= 4:
-        return '2-4'
-    if 5 <= value <= 6:
-        return '5-6'
-    return '7-10'
+    return _DETECTION_BANDS[min(max(value, 1), 10)]
 
 
 # A nested mapping representing the official AIAG‑VDA Action Priority table.
@@ -177,12 +165,51 @@ _AP_TABLE = {
 }
 
 
+def _resolve_ap(occurrence_map: Dict[str, str], d_band: str) -> str:
+    """
+    Resolve one leaf of `_AP_TABLE`.  Not every combination explicitly exists in
+    the table (e.g. severity 9–10 & occurrence 1): some occurrence bands only
+    carry a catch‑all entry keyed by '1-10', and anything else unknown defaults
+    to Low priority as per the handbook’s guidance【160702036562110†L435-L437】.
+    """
+    ap = occurrence_map.get(d_band)
+    if ap is None:
+        ap = occurrence_map.get('1-10')
+    if ap is None:
+        ap = 'L'
+    return ap
+
+
+# `_AP_TABLE` flattened to (severity band, occurrence band, detection band) keys
+# with the fall‑backs already resolved, so each lookup is a single hash.
+_AP_LOOKUP: Dict[Tuple[str, str, str], str] = {
+    (s_band, o_band, d_band): _resolve_ap(occurrence_map, d_band)
+    for s_band, severity_map in _AP_TABLE.items()
+    for o_band, occurrence_map in severity_map.items()
+    for d_band in ('1', '2-4', '5-6', '7-10')
+}
+
+# The AP for every S/O/D combination, precomputed from the bands above so
+# `calculate_ap` is a single string index: rating triple (s, o, d) sits at
+# (s - 1) * 100 + (o - 1) * 10 + (d - 1).  Combinations not covered by the
+# band table fall back to 'L'.
+_AP_BY_RATING = "".join(
+    _AP_LOOKUP.get((_classify_severity(s), _classify_occurrence(o), _classify_detection(d)), 'L')
+    for s in range(1, 11)
+    for o in range(1, 11)
+    for d in range(1, 11)
+)
+
+
 def calculate_ap(severity: int, occurrence: int, detection: int) -> str:
     """
     Determine the Action Priority (AP) rating for a given set of Severity (S),
     Occurrence (O) and Detection (D) ratings.  This implementation follows
-    the official AIAG–VDA Action Priority table by classifying each rating into
-    a band and looking up the AP value in the `_AP_TABLE` mapping【160702036562110†L392-L437】.
+    the official AIAG–VDA Action Priority table: each rating is classified into
+    a band and the AP value looked up in the `_AP_TABLE` mapping【160702036562110†L392-L437】.
+
+    The result for every combination is computed once at import time, so a
+    call only validates the ratings and indexes `_AP_BY_RATING`.
 
     Args:
         severity (int): Severity rating on a 1–10 scale.
@@ -198,22 +225,33 @@ def calculate_ap(severity: int, occurrence: int, detection: int) -> str:
     if not (1 <= severity <= 10 and 1 <= occurrence <= 10 and 1 <= detection <= 10):
         raise ValueError("Severity, occurrence and detection must be between 1 and 10.")
 
-    # Map the numeric ratings into their respective bands
-    s_band = _classify_severity(severity)
-    o_band = _classify_occurrence(occurrence)
-    d_band = _classify_detection(detection)
-
-    # Retrieve the AP value from the nested mapping.  Not every combination
-    # explicitly exists in the table (e.g. severity 9–10 & occurrence 1).  In
-    # those cases we fall back to 'L' as per the handbook’s guidance【160702036562110†L435-L437】.
-    severity_map = _AP_TABLE.get(s_band, {})
-    occurrence_map = severity_map.get(o_band, {})
-    # Some severity/occurrence bands have a catch‑all entry keyed by '1-10'.
-    ap = occurrence_map.get(d_band)
-    if ap is None:
-        # Try a catch‑all detection key if present
-        ap = occurrence_map.get('1-10')
-    if ap is None:
-        # Unknown combination defaults to Low priority
-        ap = 'L'
-    return ap
\ No newline at end of file
+    return _AP_BY_RATING[(int(severity) - 1) * 100 + (int(occurrence) - 1) * 10 + int(detection) - 1]
+
+
+# AP labels by code; code 0 marks a row without a valid set of ratings.
+_AP_LABELS = np.array([None, 'H', 'M', 'L'], dtype=object)
+_AP_CODE = {'H': 1, 'M': 2, 'L': 3}
+
+# `_AP_BY_RATING` as codes, indexed by the ratings themselves.  Index 0 on
+# any axis is left as code 0.
+_AP_CODES = np.zeros((11, 11, 11), dtype=np.uint8)
+_AP_CODES[1:, 1:, 1:] = np.array([_AP_CODE[ap] for ap in _AP_BY_RATING], dtype=np.uint8).reshape(10, 10, 10)
+
+
+def calculate_ap_array(severity, occurrence, detection) -> np.ndarray:
+    """
+    Vectorised form of :func:`calculate_ap` for whole columns of ratings.
+
+    Args:
+        severity, occurrence, detection (array-like): Ratings of equal length.
+            Values are truncated to integers like ``int(float(x))``; NaN marks
+            a missing rating.
+
+    Returns:
+        numpy.ndarray: An object array holding 'H', 'M' or 'L' per row, or
+        ``None`` where any rating is missing or outside the 1–10 range.
+    """
+    ratings = np.trunc(np.array([severity, occurrence, detection], dtype=np.float64))
+    valid = ((ratings >= 1) & (ratings <= 10)).all(axis=0)
+    index = np.where(valid, ratings, 0).astype(np.intp)
+    return _AP_LABELS[_AP_CODES[index[0], index[1], index[2]]]
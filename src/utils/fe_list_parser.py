@@ -28,14 +28,24 @@ for rec in fe_records['data']:
 
 import pandas as pd
 
-def parse(file_source):
+from src.parsers.excel_engine import EXCEL_ENGINE
+from src.parsers.parse_cache import cache_df
+
+@cache_df()
+def parse(file_source, engine=EXCEL_ENGINE):
     """
     Extracts the failure effect descriptions and severity values from the
     ``LIST`` sheet of an FMEA Excel file.
 
     Args:
-        file_source (str or file‑like): Path to the Excel file or a stream
-            containing the file data (e.g. ``io.BytesIO``).
+        file_source (str, file‑like or pd.ExcelFile): Path to the Excel
+            file, a stream containing the file data (e.g. ``io.BytesIO``),
+            or a workbook already opened by the caller so that it is not
+            unpacked a second time.
+        engine (str): The ``pandas.read_excel`` engine.  Defaults to
+            ``calamine`` when ``python-calamine`` is installed and
+            ``openpyxl`` otherwise.  It must match the engine of an
+            ``ExcelFile`` passed as the source.
 
     Returns:
         dict: A dictionary with keys ``status`` and ``data``.  On success
@@ -49,7 +59,7 @@ def parse(file_source):
         # Load the sheet as a DataFrame.  We don't specify ``header`` so
         # pandas will treat the first row as column names.  This row
         # contains the Chinese headings ``S`` and ``分數`` among others.
-        df = pd.read_excel(file_source, sheet_name=sheet_name)
+        df = pd.read_excel(file_source, sheet_name=sheet_name, engine=engine)
         if df.empty:
             return {"status": "success", "data": []}
 
@@ -71,14 +81,12 @@ def parse(file_source):
         fe_df['severity_numeric'] = pd.to_numeric(fe_df['severity'], errors='coerce')
         fe_df.dropna(subset=['severity_numeric'], inplace=True)
 
-        # Build the list of records.  Severity is cast to int for clarity.
-        records = []
-        for _, row in fe_df.iterrows():
-            records.append({
-                'failure_effect': str(row['failure_effect']).strip(),
-                'severity': int(row['severity_numeric'])
-            })
+        # Build the records column-wise.  Severity is cast to int for clarity.
+        records_df = pd.DataFrame({
+            'failure_effect': fe_df['failure_effect'].map(str).str.strip(),
+            'severity': fe_df['severity_numeric'].astype(int),
+        })
 
-        return {"status": "success", "data": records}
+        return {"status": "success", "data": records_df.to_dict('records')}
     except Exception as e:
         return {"status": "error", "message": str(e)}
\ No newline at end of file
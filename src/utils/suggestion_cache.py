@@ -0,0 +1,58 @@
+"""
+In‑process cache for AI association suggestions.
+
+Asking DIFY for CP suggestions costs a multi‑second LLM round‑trip, and users
+often click "suggest" again for an item whose data has not changed.  Entries
+are keyed on a BLAKE2b digest of the complete prompt, which already embeds
+the target FMEA item, the few‑shot examples and the candidate CP catalogue,
+so any edit to those (including new associations) yields a new key and stale
+suggestions are never served.  Entries expire after ``DEFAULT_TTL_SECONDS``.
+"""
+
+import hashlib
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+DEFAULT_TTL_SECONDS = 3600
+_MAX_ENTRIES = 512
+
+_lock = threading.Lock()
+_entries: Dict[str, Tuple[float, Any]] = {}
+
+
+def make_key(prompt: str) -> str:
+    """Return the cache key for a fully rendered prompt."""
+    return hashlib.blake2b(prompt.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def get_cached(key: str) -> Optional[Any]:
+    """Return the cached value for ``key``, or ``None`` if missing or expired."""
+    with _lock:
+        entry = _entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del _entries[key]
+            return None
+        return value
+
+
+def store(key: str, value: Any, ttl: float = DEFAULT_TTL_SECONDS) -> None:
+    """Cache ``value`` under ``key`` for ``ttl`` seconds."""
+    now = time.monotonic()
+    with _lock:
+        if len(_entries) >= _MAX_ENTRIES:
+            # Drop expired entries first, then the oldest insertions
+            for stale in [k for k, (expires_at, _) in _entries.items() if expires_at < now]:
+                del _entries[stale]
+            while len(_entries) >= _MAX_ENTRIES:
+                del _entries[next(iter(_entries))]
+        _entries[key] = (now + ttl, value)
+
+
+def clear() -> None:
+    """Drop every cached suggestion."""
+    with _lock:
+        _entries.clear()
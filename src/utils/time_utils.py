@@ -10,6 +10,7 @@ convert a datetime object into this timezone and return an ISO formatted
 string.
 """
 
+import functools
 from datetime import datetime, timezone
 from zoneinfo import ZoneInfo
 from typing import Optional
@@ -17,11 +18,17 @@ from typing import Optional
 LOCAL_ZONE = ZoneInfo("Asia/Taipei")
 UTC_ZONE = timezone.utc
 
+# Rows written in one upload or bulk update share their created_at/updated_at
+# values, so list and detail responses format the same few timestamps over
+# and over.  Datetimes are hashable and the result depends only on the
+# instant (aware) or wall-clock value (naive), so the conversion is memoized.
+@functools.lru_cache(maxsize=4096)
 def to_local(dt: Optional[datetime]) -> Optional[str]:
     """
     Convert a naive or timezone‑aware datetime into the Asia/Taipei timezone.
     If `dt` is `None`, returns `None`.  The input is assumed to represent a
-    UTC timestamp if it has no timezone information attached.
+    UTC timestamp if it has no timezone information attached.  Results are
+    cached per distinct datetime.
 
     Args:
         dt (Optional[datetime]): The datetime to convert.
@@ -37,5 +44,6 @@ def to_local(dt: Optional[datetime]) -> Optional[str]:
         dt = dt.replace(tzinfo=UTC_ZONE)
     # Convert to local timezone
     local_dt = dt.astimezone(LOCAL_ZONE)
-    # Return ISO formatted string without microseconds for readability
-    return local_dt.replace(microsecond=0).isoformat()
+    # Return ISO formatted string without microseconds for readability;
+    # timespec drops them while formatting instead of copying the datetime
+    return local_dt.isoformat(timespec="seconds")